@@ -0,0 +1,141 @@
+import re
+import zlib
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# ---------- SHINGLING ----------
+def shingle_hashes(text, shingle_size=5, token_cache=None):
+    """Unique 64-bit hashes of the word n-grams of `text` (lower-cased, punctuation dropped).
+
+    Each token is CRC32-hashed once (memoised in `token_cache`) and n-grams are
+    combined with a vectorised polynomial hash.
+    """
+    cache = {} if token_cache is None else token_cache
+    tokens = TOKEN_RE.findall(text.lower())
+    ids = np.fromiter((cache[t] if t in cache else cache.setdefault(t, zlib.crc32(t.encode("utf-8")))
+                       for t in tokens), dtype=np.uint64, count=len(tokens))
+    if len(ids) < shingle_size:
+        ids = np.concatenate([ids, np.zeros(shingle_size - len(ids), dtype=np.uint64)])
+    n = len(ids) - shingle_size + 1
+    acc = np.zeros(n, dtype=np.uint64)
+    for k in range(shingle_size):
+        # uint64 arithmetic wraps modulo 2**64, which is what the hash wants
+        acc = acc * np.uint64(1000003) + ids[k:k + n]
+    return np.unique(acc)
+
+
+# ---------- MINHASH ----------
+def minhash_signatures(texts, num_perm=128, shingle_size=5, seed=1, perm_block=16, doc_block=256):
+    """(len(texts), num_perm) MinHash signatures using multiply-shift hashing of the shingles.
+
+    Documents are shingled `doc_block` at a time; each block's shingles are
+    concatenated and reduced per document with `np.minimum.reduceat`,
+    `perm_block` permutations at a time, so memory is bounded by one block
+    rather than the corpus.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    texts = list(texts)
+    cache = {}
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    for lo in range(0, len(texts), doc_block):
+        hashes = [shingle_hashes(text, shingle_size, cache) for text in texts[lo:lo + doc_block]]
+        offsets = np.cumsum([0] + [len(h) for h in hashes[:-1]])
+        flat = np.concatenate(hashes)
+        for start in range(0, num_perm, perm_block):
+            stop = min(start + perm_block, num_perm)
+            # the high 32 bits of a*h + b (mod 2**64) are a universal hash of h
+            mixed = a[start:stop, None] * flat[None, :]
+            mixed += b[start:stop, None]
+            mixed >>= np.uint64(32)
+            signatures[lo:lo + len(hashes), start:stop] = np.minimum.reduceat(mixed, offsets, axis=1).T
+    return signatures
+
+
+# ---------- LSH ----------
+def lsh_candidate_pairs(signatures, bands=16):
+    """Index pairs that share at least one identical band of their signatures."""
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    pairs = set()
+    for band in range(bands):
+        buckets = {}
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for i in range(n):
+            buckets.setdefault(chunk[i].tobytes(), []).append(i)
+        for members in buckets.values():
+            for j, first in enumerate(members):
+                for second in members[j + 1:]:
+                    pairs.add((first, second))
+    return pairs
+
+
+def cluster_near_duplicates(texts, threshold=0.8, num_perm=128, bands=16, shingle_size=5):
+    """Cluster id per text, plus the signatures.
+
+    LSH candidates whose estimated Jaccard similarity reaches `threshold` are merged.
+    """
+    signatures = minhash_signatures(texts, num_perm=num_perm, shingle_size=shingle_size)
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in lsh_candidate_pairs(signatures, bands=bands):
+        if np.mean(signatures[i] == signatures[j]) >= threshold:
+            parent[find(j)] = find(i)
+    return np.array([find(i) for i in range(len(texts))]), signatures
+
+
+# ---------- ARTICLE DEDUP ----------
+def dedupe_by_id(records, text_key='content', id_key='Doc_ID'):
+    """Keeps one record per id (the longest content, in first-seen order); returns (unique, n_dropped).
+
+    Factiva accession numbers identify an article, so repeated ids are the
+    same article exported twice and need no text comparison.
+    """
+    best = {}
+    for i, r in enumerate(records):
+        j = best.get(r[id_key])
+        if j is None or len(r[text_key]) > len(records[j][text_key]):
+            best[r[id_key]] = i
+    unique = [records[i] for i in sorted(best.values())]
+    return unique, len(records) - len(unique)
+
+
+def dedupe_articles(records, threshold=0.8, text_key='content', id_key='Doc_ID'):
+    """Keeps one canonical record per near-duplicate cluster.
+
+    The canonical copy is the longest content in the cluster (first seen on
+    ties). Returns (unique_records, duplicates) where each duplicate row maps
+    its `id_key` to the canonical one.
+    """
+    if not records:
+        return [], []
+    labels, signatures = cluster_near_duplicates([r[text_key] for r in records], threshold=threshold)
+
+    canonical = {}
+    for i, label in enumerate(labels):
+        best = canonical.get(label)
+        if best is None or len(records[i][text_key]) > len(records[best][text_key]):
+            canonical[label] = i
+
+    unique, duplicates = [], []
+    for i, label in enumerate(labels):
+        keep = canonical[label]
+        if i == keep:
+            unique.append(records[i])
+            continue
+        duplicates.append({
+            id_key: records[i][id_key],
+            'canonical_' + id_key: records[keep][id_key],
+            'title': records[i]['title'],
+            'similarity': round(float(np.mean(signatures[i] == signatures[keep])), 4),
+        })
+    return unique, duplicates
@@ -0,0 +1,189 @@
+import base64
+import json
+import numpy as np
+import pandas as pd
+
+# Browser-side 3D event explorer. Coordinates and hover metadata are shipped
+# once as base64 typed arrays; the date-range sliders and topic legend filter
+# them in the page and redraw the WebGL scatter without a Streamlit rerun.
+#
+#   html = explorer_html(events, color="assigned_topic", hover_columns=[...])
+#   components.html(html, height=760)
+
+DAY = np.timedelta64(1, "D")
+
+
+def _b64(array):
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")
+
+
+def _pack_column(series):
+    """Numbers become Float32 arrays (NaN kept); anything else becomes codes into a label list."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return {"kind": "f32", "data": _b64(series.to_numpy(dtype=np.float32))}
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime("%Y-%m-%d")
+    codes, labels = pd.factorize(series.astype(object).where(series.notna(), ""), sort=False)
+    return {"kind": "cat", "data": _b64(codes.astype(np.uint32)), "labels": [str(v) for v in labels]}
+
+
+def pack_events(events, color="assigned_topic", hover_name="Headline", hover_columns=()):
+    """Date-sorted typed-array payload for the explorer; all strings are stored once per distinct value."""
+    events = events.dropna(subset=["Date"]).sort_values("Date", kind="stable").reset_index(drop=True)
+    days = (events["Date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+            - np.datetime64("1970-01-01", "D")) // DAY
+    topics, topic_labels = pd.factorize(events[color].astype(str), sort=True)
+    columns = [c for c in hover_columns if c in events.columns and c not in (color, hover_name, "Date")]
+    return {
+        "n": len(events),
+        "x": _b64(events["x"].to_numpy(dtype=np.float32)),
+        "y": _b64(events["y"].to_numpy(dtype=np.float32)),
+        "z": _b64(events["z"].to_numpy(dtype=np.float32)),
+        "day": _b64(days.astype(np.int32)),
+        "topic": _b64(topics.astype(np.uint32)),
+        "topic_labels": [str(t) for t in topic_labels],
+        "color": color,
+        "name": _pack_column(events[hover_name]) if hover_name in events.columns else None,
+        "hover": {c: _pack_column(events[c]) for c in columns},
+    }
+
+
+def _script_json(value):
+    # headlines may contain "</script>"; escaping the slash keeps them inside the tag
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def _plotlyjs_tag(include_plotlyjs):
+    # same switch as plotly's to_html: True inlines the bundled plotly.js (works
+    # offline, like st.plotly_chart), "cdn" links the matching cdn.plot.ly build
+    import plotly.offline
+
+    if include_plotlyjs == "cdn":
+        return f'<script src="https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"></script>'
+    return f"<script>{plotly.offline.get_plotlyjs()}</script>"
+
+
+def explorer_html(events, color="assigned_topic", hover_name="Headline", hover_columns=(),
+                  title="3D Projection of News Articles", start=None, end=None,
+                  height=700, include_plotlyjs=True):
+    """Self-contained HTML page for `components.html`.
+
+    `events` needs Date, x, y, z and `color`; `start` / `end` set the initial
+    date window, which the user then moves in the browser. plotly.js is
+    inlined by default so the page needs no internet access.
+    """
+    payload = pack_events(events, color, hover_name, hover_columns)
+    initial = [None if d is None else int((np.datetime64(pd.Timestamp(d).date()) - np.datetime64("1970-01-01")) // DAY)
+               for d in (start, end)]
+    return (_TEMPLATE
+            .replace("__PLOTLYJS__", _plotlyjs_tag(include_plotlyjs))
+            .replace("__HEIGHT__", str(int(height)))
+            .replace("__TITLE__", _script_json(title))
+            .replace("__INITIAL__", json.dumps(initial))
+            .replace("__PAYLOAD__", _script_json(payload)))
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8">__PLOTLYJS__
+<style>
+  body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: #fafafa; background: transparent; }
+  #controls { display: flex; gap: 1.5em; align-items: center; padding: 4px 8px; font-size: 14px; }
+  #controls input[type=range] { flex: 1; accent-color: gold; }
+  #count { min-width: 12em; text-align: right; }
+</style></head>
+<body>
+<div id="controls">
+  <label>Start <b id="startLabel"></b></label><input id="start" type="range">
+  <label>End <b id="endLabel"></b></label><input id="end" type="range">
+  <span id="count"></span>
+</div>
+<div id="plot" style="height:__HEIGHT__px"></div>
+<script>
+const P = __PAYLOAD__;
+const INITIAL = __INITIAL__;
+
+function decode(b64, T) {
+  const s = atob(b64), u = new Uint8Array(s.length);
+  for (let i = 0; i < s.length; i++) u[i] = s.charCodeAt(i);
+  return new T(u.buffer);
+}
+const X = decode(P.x, Float32Array), Y = decode(P.y, Float32Array), Z = decode(P.z, Float32Array);
+const DAY = decode(P.day, Int32Array), TOPIC = decode(P.topic, Uint32Array);
+function column(c) { return {kind: c.kind, data: decode(c.data, c.kind === "f32" ? Float32Array : Uint32Array), labels: c.labels}; }
+const NAME = P.name && column(P.name);
+const HOVER = Object.entries(P.hover).map(([k, c]) => [k, column(c)]);
+const isoDay = d => new Date(d * 86400000).toISOString().slice(0, 10);
+
+// Rows are date-sorted, so each topic's rows are too: gather them once and a
+// date window is then a contiguous slice of every trace, found by binary search.
+const groups = P.topic_labels.map((label, t) => {
+  const idx = [];
+  for (let i = 0; i < P.n; i++) if (TOPIC[i] === t) idx.push(i);
+  const m = idx.length, g = {label, day: new Int32Array(m), x: new Float32Array(m),
+                             y: new Float32Array(m), z: new Float32Array(m), name: new Array(m), text: new Array(m)};
+  idx.forEach((i, k) => {
+    g.day[k] = DAY[i]; g.x[k] = X[i]; g.y[k] = Y[i]; g.z[k] = Z[i];
+    g.name[k] = NAME ? NAME.labels[NAME.data[i]] : "";
+    const rows = [`${P.color}=${label}`, `Date=${isoDay(DAY[i])}`];
+    for (const [key, c] of HOVER) {
+      const v = c.kind === "f32" ? c.data[i] : c.labels[c.data[i]];
+      rows.push(`${key}=${typeof v === "number" ? (isNaN(v) ? "" : +v.toFixed(4)) : v}`);
+    }
+    g.text[k] = rows.join("<br>");
+  });
+  return g;
+});
+
+function lowerBound(a, v) {
+  let lo = 0, hi = a.length;
+  while (lo < hi) { const mid = (lo + hi) >> 1; if (a[mid] < v) lo = mid + 1; else hi = mid; }
+  return lo;
+}
+
+const minDay = P.n ? DAY[0] : 0, maxDay = P.n ? DAY[P.n - 1] : 0;
+const startInput = document.getElementById("start"), endInput = document.getElementById("end");
+for (const el of [startInput, endInput]) { el.min = minDay; el.max = maxDay; el.step = 1; }
+startInput.value = INITIAL[0] === null ? minDay : Math.max(minDay, INITIAL[0]);
+endInput.value = INITIAL[1] === null ? maxDay : Math.min(maxDay, INITIAL[1]);
+
+const layout = {
+  title: {text: __TITLE__}, margin: {l: 0, r: 0, b: 0, t: 40}, uirevision: "explorer",
+  paper_bgcolor: "rgba(0,0,0,0)", font: {color: "#fafafa"}, legend: {title: {text: P.color}},
+  scene: {xaxis: {title: {text: "PCA1"}}, yaxis: {title: {text: "PCA2"}}, zaxis: {title: {text: "PCA3"}}},
+};
+const hidden = new Set();
+let pending = false;
+
+function draw() {
+  pending = false;
+  let lo = +startInput.value, hi = +endInput.value;
+  if (lo > hi) [lo, hi] = [hi, lo];
+  document.getElementById("startLabel").textContent = isoDay(lo);
+  document.getElementById("endLabel").textContent = isoDay(hi);
+  let shown = 0;
+  const traces = groups.map(g => {
+    const a = lowerBound(g.day, lo), b = lowerBound(g.day, hi + 1);
+    if (!hidden.has(g.label)) shown += b - a;
+    return {type: "scatter3d", mode: "markers", name: g.label, marker: {size: 3},
+            visible: hidden.has(g.label) ? "legendonly" : true,
+            x: g.x.subarray(a, b), y: g.y.subarray(a, b), z: g.z.subarray(a, b),
+            hovertext: g.name.slice(a, b), text: g.text.slice(a, b),
+            hovertemplate: "<b>%{hovertext}</b><br>%{text}<extra></extra>"};
+  });
+  document.getElementById("count").textContent = `${shown} of ${P.n} articles`;
+  Plotly.react("plot", traces, layout, {responsive: true});
+}
+function schedule() { if (!pending) { pending = true; requestAnimationFrame(draw); } }
+
+startInput.addEventListener("input", schedule);
+endInput.addEventListener("input", schedule);
+draw();
+// legend clicks toggle topics in place; remember them so date moves keep the selection
+document.getElementById("plot").on("plotly_restyle", () => {
+  hidden.clear();
+  for (const t of document.getElementById("plot").data) if (t.visible === "legendonly") hidden.add(t.name);
+  schedule();
+});
+</script>
+</body></html>
+"""
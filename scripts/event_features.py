@@ -0,0 +1,247 @@
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+
+# Event-conditioned design matrix for predictive work. Each event is anchored
+# to the last trading bar strictly before its date, so the indicator context
+# is what was known before the news and forward returns start from that
+# close. Rows are [context indicators | relevance scores | topic one-hot |
+# summary embedding] as one contiguous float32 matrix, with forward returns
+# as targets. Builds are cached on disk by data version; when only new events
+# or new bars arrive, just the affected rows are recomputed.
+
+HORIZONS = (1, 5, 20)
+CONTEXT_COLUMNS = ["RSI_14", "Volatility_30", "MACD", "Signal", "MA_corr", "Pct_Change"]
+SCORE_COLUMNS = ["gold_relevance_score", "topic_similarity"]
+TOPIC_COLUMN = "assigned_topic_bert"
+FEATURE_CACHE = os.path.join(os.path.dirname(__file__), "event_features.npz")
+
+
+# ---------- ALIGNMENT ----------
+def align_events(event_dates, bar_dates):
+    """Index of the last bar strictly before each event date (-1 when there is none)."""
+    bars = pd.to_datetime(bar_dates).to_numpy(dtype="datetime64[ns]")
+    events = pd.to_datetime(event_dates).to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    return np.searchsorted(bars, events.astype("datetime64[ns]"), side="left") - 1
+
+
+def forward_returns(prices, anchors, horizons=HORIZONS):
+    """(n_events, n_horizons) simple returns from the anchor close; NaN past the last bar."""
+    prices = np.asarray(prices, dtype=np.float64)
+    anchors = np.asarray(anchors)
+    target = anchors[:, None] + np.asarray(horizons)[None, :]
+    ok = (anchors[:, None] >= 0) & (target < len(prices))
+    base = prices[np.clip(anchors, 0, None)][:, None]
+    out = prices[np.clip(target, 0, len(prices) - 1)] / base - 1.0
+    return np.where(ok, out, np.nan).astype(np.float32)
+
+
+def _event_embeddings(events, embeddings):
+    if "embedding_row" in events.columns:
+        embeddings = embeddings[events["embedding_row"].to_numpy()]
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    # a 2-d block keeps its width even with no rows, where reshape(0, -1) is ambiguous
+    return embeddings if embeddings.ndim == 2 else embeddings.reshape(len(events), -1)
+
+
+def row_keys(events, embeddings):
+    """Per-event fingerprint of everything that goes into its row except the prices."""
+    meta = events["Doc_ID"].astype(str) + "|" + events["Date"].astype(str)
+    for col in [TOPIC_COLUMN] + SCORE_COLUMNS:
+        if col in events.columns:
+            meta = meta + "|" + events[col].astype(str)
+    meta = meta.to_numpy()
+    emb = _event_embeddings(events, embeddings)
+    return np.array([hashlib.sha1(m.encode() + e.tobytes()).hexdigest()[:20] for m, e in zip(meta, emb)])
+
+
+def data_version(prices, keys):
+    """Content hash of the bars and event rows a feature set was built from."""
+    h = hashlib.sha1(_price_prefix_hash(prices, len(prices)).encode())
+    h.update("\n".join(keys).encode())
+    return h.hexdigest()
+
+
+def _price_prefix_hash(prices, n):
+    h = hashlib.sha1()
+    h.update(prices["Date"].to_numpy(dtype="datetime64[ns]")[:n].tobytes())
+    h.update(prices["Price"].to_numpy(dtype=np.float64)[:n].tobytes())
+    return h.hexdigest()
+
+
+# ---------- BUILD ----------
+class EventFeatures:
+    """X (n, p) float32 features, y (n, len(horizons)) float32 targets and row metadata."""
+
+    def __init__(self, X, y, feature_names, target_names, doc_ids, dates, anchors, keys, topics,
+                 n_bars=0, price_hash="", version=""):
+        self.X, self.y = X, y
+        self.feature_names, self.target_names = list(feature_names), list(target_names)
+        self.doc_ids, self.dates, self.anchors = np.asarray(doc_ids), np.asarray(dates), np.asarray(anchors)
+        self.keys = np.asarray(keys)
+        self.topics = list(topics)
+        self.n_bars, self.price_hash, self.version = n_bars, price_hash, version
+
+    def __len__(self):
+        return len(self.X)
+
+    @property
+    def complete(self):
+        """Rows whose every horizon already has a realised return."""
+        return ~np.isnan(self.y).any(axis=1)
+
+    def frame(self):
+        return pd.DataFrame(np.hstack([self.X, self.y]), columns=self.feature_names + self.target_names,
+                            index=pd.Index(self.doc_ids, name="Doc_ID"))
+
+    def save(self, path=FEATURE_CACHE):
+        np.savez(path, X=self.X, y=self.y, feature_names=self.feature_names, target_names=self.target_names,
+                 doc_ids=self.doc_ids.astype(str), dates=self.dates.astype("datetime64[ns]"),
+                 anchors=self.anchors, keys=self.keys.astype(str), topics=np.asarray(self.topics, dtype=str),
+                 meta=np.asarray([self.n_bars, self.price_hash, self.version], dtype=str))
+
+    @classmethod
+    def load(cls, path=FEATURE_CACHE):
+        with np.load(path) as f:
+            n_bars, price_hash, version = f["meta"]
+            return cls(f["X"], f["y"], f["feature_names"].tolist(), f["target_names"].tolist(), f["doc_ids"],
+                       f["dates"], f["anchors"], f["keys"], f["topics"].tolist(), int(n_bars), str(price_hash), str(version))
+
+
+def build_features(prices, events, embeddings, horizons=HORIZONS, topics=None):
+    """Design matrix for `events` against `prices` (a frame from add_indicators).
+
+    `embeddings` rows line up with `events` (or are looked up through its
+    embedding_row column); `topics` fixes the one-hot vocabulary, defaulting
+    to the sorted topics present.
+    """
+    anchors = align_events(events["Date"], prices["Date"])
+    valid = np.clip(anchors, 0, None)
+    context = prices[CONTEXT_COLUMNS].to_numpy(dtype=np.float32)[valid]
+    context[anchors < 0] = np.nan
+
+    scores = np.column_stack([events[c].to_numpy(dtype=np.float32) if c in events.columns
+                              else np.full(len(events), np.nan, np.float32) for c in SCORE_COLUMNS])
+    labels = events[TOPIC_COLUMN].astype(str).to_numpy() if TOPIC_COLUMN in events.columns else np.full(len(events), "")
+    topics = sorted(set(labels)) if topics is None else list(topics)
+    one_hot = (labels[:, None] == np.asarray(topics, dtype=object)[None, :]).astype(np.float32)
+
+    keys = row_keys(events, embeddings)
+    embeddings = _event_embeddings(events, embeddings)
+
+    X = np.empty((len(events), context.shape[1] + scores.shape[1] + len(topics) + embeddings.shape[1]),
+                 dtype=np.float32)
+    np.concatenate([context, scores, one_hot, embeddings], axis=1, out=X)
+    names = (CONTEXT_COLUMNS + SCORE_COLUMNS + [f"topic={t}" for t in topics]
+             + [f"emb_{i}" for i in range(embeddings.shape[1])])
+    y = forward_returns(prices["Price"], anchors, horizons)
+    return EventFeatures(X, y, names, [f"fwd_ret_{h}d" for h in horizons], events["Doc_ID"].astype(str),
+                         events["Date"].to_numpy(dtype="datetime64[ns]"), anchors, keys, topics,
+                         n_bars=len(prices), price_hash=_price_prefix_hash(prices, len(prices)),
+                         version=data_version(prices, keys))
+
+
+# ---------- INCREMENTAL ----------
+def update_features(prices, events, embeddings, cache_path=FEATURE_CACHE, horizons=HORIZONS):
+    """Cached build for this data version; otherwise rebuilds only the rows that changed.
+
+    Indicators are causal, so appending bars leaves every existing row's
+    context intact; only new events and rows still missing a forward return
+    are rebuilt. Revised history, a new topic or different horizons force a
+    full rebuild.
+    """
+    keys = row_keys(events, embeddings)
+    version = data_version(prices, keys)
+    cached = EventFeatures.load(cache_path) if os.path.exists(cache_path) else None
+    if cached is not None and cached.version == version:
+        return cached
+
+    labels = set(events[TOPIC_COLUMN].astype(str)) if TOPIC_COLUMN in events.columns else {""}
+    reusable = (cached is not None
+                and cached.n_bars <= len(prices)
+                and cached.price_hash == _price_prefix_hash(prices, cached.n_bars)
+                and labels <= set(cached.topics)
+                and cached.target_names == [f"fwd_ret_{h}d" for h in horizons])
+    if not reusable:
+        features = build_features(prices, events, embeddings, horizons)
+    else:
+        # rows are matched on content keys, so an edited event (new topic, score
+        # or embedding) is rebuilt; pd.Index hashes where np.isin would compare pairwise
+        keep = pd.Index(cached.keys).isin(keys) & cached.complete
+        stale = ~pd.Index(keys).isin(cached.keys[keep])
+        position = pd.Index(keys).get_indexer(cached.keys[keep])
+        if stale.any():
+            fresh = build_features(prices, events[stale], embeddings if "embedding_row" in events.columns
+                                   else np.asarray(embeddings)[stale], horizons, topics=cached.topics)
+            # merge and restore the event order a full build would produce
+            order = np.argsort(np.concatenate([position, np.flatnonzero(stale)]), kind="stable")
+
+            def merged(a, b):
+                return np.concatenate([a, b])[order]
+        else:
+            # new bars only, and every cached row already complete: nothing to build
+            fresh = EventFeatures(cached.X[:0], cached.y[:0], cached.feature_names, cached.target_names,
+                                  [], [], [], [], cached.topics)
+            order = np.argsort(position, kind="stable")
+
+            def merged(a, b):
+                return a[order]
+
+        features = EventFeatures(np.ascontiguousarray(merged(cached.X[keep], fresh.X)),
+                                 merged(cached.y[keep], fresh.y), cached.feature_names, cached.target_names,
+                                 merged(cached.doc_ids[keep], fresh.doc_ids), merged(cached.dates[keep], fresh.dates),
+                                 merged(cached.anchors[keep], fresh.anchors), keys, cached.topics,
+                                 n_bars=len(prices), price_hash=_price_prefix_hash(prices, len(prices)),
+                                 version=version)
+        print(f"Feature cache: reused {keep.sum()} rows, rebuilt {stale.sum()}")
+    features.save(cache_path)
+    return features
+
+
+def check_incremental(prices, events, embeddings, new_bars=(1, 30), horizons=HORIZONS):
+    """Compares update_features against a full build after appending bars.
+
+    For each count in `new_bars` the cache is built on the history without
+    the last bars, with indicators recomputed on that shorter history as a
+    real earlier run would have, then updated with the full history; once
+    with every event and once with only the events already complete at the
+    cut, where no row needs rebuilding. Returns the cases whose result differs.
+    """
+    import tempfile
+    from utils import add_indicators
+
+    full = build_features(prices, events, embeddings, horizons)
+    failures = []
+    for n in new_bars:
+        cut = add_indicators(prices.loc[:len(prices) - n - 1, ["Date", "Price"]].copy())
+        done = (align_events(events["Date"], cut["Date"]) + max(horizons) < len(cut)) & (full.anchors >= 0)
+        for label, mask in (("all events", np.ones(len(events), bool)), ("complete events only", done)):
+            subset = events[mask]
+            emb = embeddings if "embedding_row" in events.columns else np.asarray(embeddings)[mask]
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "features.npz")
+                update_features(cut, subset, emb, path, horizons)
+                got = update_features(prices, subset, emb, path, horizons)
+            want = build_features(prices, subset, emb, horizons, topics=got.topics)
+            if not (np.array_equal(got.X, want.X, equal_nan=True) and np.array_equal(got.y, want.y, equal_nan=True)
+                    and np.array_equal(got.doc_ids, want.doc_ids) and got.version == want.version):
+                failures.append(f"+{n} bars, {label}")
+    return failures
+
+
+if __name__ == "__main__":
+    import sys
+    from event_store import EMBEDDING_COLUMN, load_events
+    from utils import add_indicators, load_futures
+
+    # usage: python event_features.py [--check]
+    prices = add_indicators(load_futures("GC=F", start="2000-01-01")).reset_index(drop=True)
+    events, embeddings = load_events(columns=["Doc_ID", TOPIC_COLUMN] + SCORE_COLUMNS + [EMBEDDING_COLUMN])
+    if "--check" in sys.argv[1:]:
+        failures = check_incremental(prices, events, embeddings)
+        print("✅ Incremental updates match full builds" if not failures else f"❌ Mismatch: {failures}")
+        sys.exit(bool(failures))
+    features = update_features(prices, events, embeddings)
+    print(f"X {features.X.shape} {features.X.dtype}, y {features.y.shape}, "
+          f"{features.complete.sum()} rows with all horizons, saved to {FEATURE_CACHE}")
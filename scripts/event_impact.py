@@ -0,0 +1,216 @@
+import os
+import joblib
+from joblib import Parallel, delayed
+import numpy as np
+import pandas as pd
+from event_features import HORIZONS, build_features
+
+# Event-impact prediction: forward gold returns (in %) from the event feature
+# matrix, one SGDRegressor per horizon behind a streaming StandardScaler. Both
+# support partial_fit, so each new day of completed events updates the model
+# instead of retraining it. Walk-forward folds run in parallel with joblib.
+
+BASE_DIR = os.path.dirname(__file__)
+MODEL_PATH = os.path.join(BASE_DIR, "event_impact_model.joblib")
+PREDICTIONS_CSV = os.path.join(BASE_DIR, "event_impact_predictions.csv")
+
+
+# ---------- MODEL ----------
+class ImpactModel:
+    def __init__(self, horizons=HORIZONS, alpha=1e-3, eta0=1e-3, batch_size=256, epochs=3, random_state=0):
+        # scikit-learn is imported here so pages that only read predictions never load it
+        from sklearn.linear_model import SGDRegressor
+        from sklearn.preprocessing import StandardScaler
+
+        self.horizons = list(horizons)
+        self.batch_size, self.epochs = batch_size, epochs
+        self.scaler = StandardScaler()
+        self.regressors = [SGDRegressor(penalty="l2", alpha=alpha, learning_rate="invscaling", eta0=eta0,
+                                        random_state=random_state) for _ in self.horizons]
+        self.feature_names, self.topics = None, None
+        self.trained_keys = set()
+
+    def _transform(self, X):
+        # the scaler ignores NaN while fitting; missing context becomes the running mean (0)
+        return np.nan_to_num(self.scaler.transform(X), nan=0.0, posinf=0.0, neginf=0.0)
+
+    def partial_fit(self, X, y):
+        """One update from a batch of rows; y is (n, len(horizons)) returns, NaN where unknown."""
+        X = np.asarray(X, dtype=np.float32)
+        self.scaler.partial_fit(X)
+        Z = self._transform(X)
+        y = np.asarray(y, dtype=np.float64) * 100
+        for k, reg in enumerate(self.regressors):
+            ok = np.isfinite(y[:, k])
+            if ok.any():
+                reg.partial_fit(Z[ok], y[ok, k])
+        return self
+
+    def fit_stream(self, X, y, order=None):
+        """Trains in time order (`order` sorts rows) in mini-batches, `epochs` passes."""
+        order = np.arange(len(X)) if order is None else np.asarray(order)
+        for _ in range(self.epochs):
+            for lo in range(0, len(order), self.batch_size):
+                rows = order[lo:lo + self.batch_size]
+                self.partial_fit(X[rows], y[rows])
+        return self
+
+    def predict(self, X, batch_size=4096):
+        """(n, len(horizons)) predicted forward returns in %, computed in batches."""
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty((len(X), len(self.horizons)))
+        for lo in range(0, len(X), batch_size):
+            Z = self._transform(X[lo:lo + batch_size])
+            out[lo:lo + batch_size] = np.column_stack([reg.predict(Z) for reg in self.regressors])
+        return out
+
+    # ---------- INCREMENTAL ----------
+    def fit_features(self, features):
+        """Initial training on every complete row of an EventFeatures set."""
+        if len(features.target_names) != len(self.horizons):
+            raise ValueError(f"features have targets {features.target_names}, model horizons {self.horizons}")
+        self.feature_names, self.topics = features.feature_names, features.topics
+        rows = np.flatnonzero(features.complete)
+        self.fit_stream(features.X, features.y, rows[np.argsort(features.dates[rows], kind="stable")])
+        self.trained_keys = set(features.keys[rows])
+        return self
+
+    def update(self, features):
+        """Single pass over rows completed since the last update; returns how many were learned."""
+        if features.feature_names != self.feature_names:
+            raise ValueError("feature layout changed (new topic or embedding size); retrain with fit_features")
+        new = np.flatnonzero(features.complete & ~pd.Index(features.keys).isin(list(self.trained_keys)))
+        new = new[np.argsort(features.dates[new], kind="stable")]
+        for lo in range(0, len(new), self.batch_size):
+            rows = new[lo:lo + self.batch_size]
+            self.partial_fit(features.X[rows], features.y[rows])
+        self.trained_keys.update(features.keys[new])
+        return len(new)
+
+    def save(self, path=MODEL_PATH):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path=MODEL_PATH):
+        return joblib.load(path)
+
+
+# ---------- WALK-FORWARD ----------
+def walk_forward_splits(dates, n_folds=5, embargo_days=None, horizons=HORIZONS):
+    """Expanding-window (train, test) index pairs in time order.
+
+    Training rows dated within `embargo_days` of the test block are dropped,
+    since their forward returns overlap the test period (default: the longest
+    horizon in calendar days).
+    """
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    if embargo_days is None:
+        embargo_days = int(np.ceil(max(horizons) * 7 / 5)) + 2
+    order = np.argsort(dates, kind="stable")
+    blocks = np.array_split(order, n_folds + 1)
+    splits = []
+    for k in range(1, n_folds + 1):
+        test = blocks[k]
+        if len(test) == 0:
+            continue
+        cutoff = dates[test].min() - np.timedelta64(embargo_days, "D")
+        train = np.concatenate(blocks[:k])
+        train = train[dates[train] < cutoff]
+        splits.append((train, test))
+    return splits
+
+
+def fold_metrics(y_true, y_pred, horizons=HORIZONS):
+    rows = {}
+    for k, h in enumerate(horizons):
+        t, p = np.asarray(y_true[:, k], dtype=np.float64) * 100, y_pred[:, k]
+        ok = np.isfinite(t)
+        t, p = t[ok], p[ok]
+        rows[f"hit_rate_{h}d"] = float((np.sign(t) == np.sign(p)).mean()) if len(t) else np.nan
+        rows[f"ic_{h}d"] = float(np.corrcoef(t, p)[0, 1]) if len(t) > 2 and t.std() > 0 and p.std() > 0 else np.nan
+        rows[f"mae_{h}d"] = float(np.abs(t - p).mean()) if len(t) else np.nan
+    return rows
+
+
+def _run_fold(X, y, dates, train, test, model_params):
+    model = ImpactModel(**model_params)
+    train = train[np.isfinite(y[train]).all(axis=1)]
+    model.fit_stream(X, y, train[np.argsort(dates[train], kind="stable")])
+    pred = model.predict(X[test])
+    return test, pred, {"train_rows": len(train), "test_rows": len(test), "test_start": str(dates[test].min())[:10],
+                        **fold_metrics(y[test], pred, model.horizons)}
+
+
+def walk_forward(features, n_folds=5, n_jobs=-1, **model_params):
+    """Runs every fold in parallel; returns (per-fold metrics frame, out-of-sample predictions in %).
+
+    Rows never in a test block (the first training block) get NaN predictions.
+    """
+    model_params.setdefault("horizons", [int(n[len("fwd_ret_"):-1]) for n in features.target_names])
+    splits = walk_forward_splits(features.dates, n_folds, horizons=model_params["horizons"])
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_run_fold)(features.X, features.y, features.dates, train, test, model_params)
+        for train, test in splits)
+    oos = np.full(features.y.shape, np.nan)
+    for test, pred, _ in results:
+        oos[test] = pred
+    return pd.DataFrame([metrics for _, _, metrics in results]), oos
+
+
+# ---------- SERVING ----------
+def predict_events(model, prices, events, embeddings):
+    """Batched predictions for a day's new articles (any events not seen in training)."""
+    features = build_features(prices, events, embeddings, model.horizons, topics=model.topics)
+    return prediction_frame(features, model.predict(features.X), model.horizons)
+
+
+def prediction_frame(features, pred, horizons, rows=slice(None)):
+    out = pd.DataFrame(pred, columns=[f"pred_ret_{h}d" for h in horizons])
+    out.insert(0, "Doc_ID", features.doc_ids[rows])
+    out.insert(0, "Date", pd.to_datetime(features.dates[rows]))
+    return out
+
+
+def load_predictions(path=PREDICTIONS_CSV):
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, parse_dates=["Date"])
+
+
+def predictions_mtime(path=PREDICTIONS_CSV):
+    """Modification time of the predictions file (None when missing), to key caches on."""
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+if __name__ == "__main__":
+    import sys
+    from event_features import SCORE_COLUMNS, TOPIC_COLUMN, update_features
+    from event_store import EMBEDDING_COLUMN, load_events
+    from utils import add_indicators, load_futures
+
+    # usage: python event_impact.py [train|update]
+    mode = sys.argv[1] if len(sys.argv) > 1 else "train"
+    prices = add_indicators(load_futures("GC=F", start="2000-01-01")).reset_index(drop=True)
+    events, embeddings = load_events(columns=["Doc_ID", TOPIC_COLUMN] + SCORE_COLUMNS + [EMBEDDING_COLUMN])
+    features = update_features(prices, events, embeddings)
+
+    previous = load_predictions()
+    if mode == "update" and os.path.exists(MODEL_PATH) and previous is not None:
+        model = ImpactModel.load()
+        print(f"Updated model with {model.update(features)} newly completed events")
+        # earlier predictions (incl. walk-forward ones) stay; only unseen events are scored
+        new = ~pd.Index(features.doc_ids).isin(previous["Doc_ID"].astype(str))
+        fresh = prediction_frame(features, model.predict(features.X[new]), model.horizons, new)
+        fresh["out_of_sample"] = True  # scored before their returns were learned
+        out = pd.concat([previous, fresh], ignore_index=True).sort_values("Date", kind="stable")
+    else:
+        report, oos = walk_forward(features)
+        print(report.to_string(index=False, float_format="{:.3f}".format))
+        model = ImpactModel().fit_features(features)
+        # walk-forward (out-of-sample) predictions where available, final model elsewhere
+        pred = model.predict(features.X)
+        out = prediction_frame(features, np.where(np.isnan(oos), pred, oos), model.horizons)
+        out["out_of_sample"] = ~np.isnan(oos).all(axis=1) | ~features.complete
+    model.save()
+    out.to_csv(PREDICTIONS_CSV, index=False)
+    print(f"✅ Saved model to {MODEL_PATH} and predictions to {PREDICTIONS_CSV}")
@@ -0,0 +1,192 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Date-partitioned Parquet copy of the event CSVs. Columns are typed once at
+# write time (datetime64 dates, categorical topics, float32 scores and
+# embeddings) and readers only touch the columns and year/month partitions
+# covering the window they ask for.
+
+BASE_DIR = os.path.dirname(__file__)
+EVENT_CSV = os.path.join(BASE_DIR, "causal_gold_articles_with_topics_bert.csv")
+EVENT_DATASET = os.path.join(BASE_DIR, "causal_gold_events")
+
+CATEGORICAL_COLUMNS = ["assigned_topic", "assigned_topic_bert"]
+FLOAT32_COLUMNS = ["gold_relevance_score", "topic_similarity", "x", "y", "z"]
+EMBEDDING_COLUMN = "gold_general_embedding"
+EMBEDDING_ROW = "embedding_row"
+
+
+# ---------- WRITE ----------
+def to_event_table(df):
+    """Types a raw event frame for columnar storage (stringified embeddings become float32 lists)."""
+    import pyarrow as pa
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df = df.dropna(subset=["Date"]).sort_values("Date", kind="stable")
+    df["year"] = df["Date"].dt.year.astype("int16")
+    df["month"] = df["Date"].dt.month.astype("int8")
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+
+    embeddings = None
+    if EMBEDDING_COLUMN in df.columns:
+        # the CSV stores Python list reprs, which are valid JSON and parse far faster than literal_eval
+        embeddings = [np.asarray(json.loads(x), dtype=np.float32) for x in df.pop(EMBEDDING_COLUMN)]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if embeddings is not None:
+        dim = len(embeddings[0]) if embeddings else 0
+        values = pa.array(np.concatenate(embeddings) if embeddings else np.empty(0, np.float32))
+        table = table.append_column(EMBEDDING_COLUMN, pa.FixedSizeListArray.from_arrays(values, dim))
+    return table
+
+
+def write_event_dataset(csv_path=EVENT_CSV, out_dir=EVENT_DATASET):
+    """Rewrites the whole dataset from the CSV.
+
+    It is written next to `out_dir` and swapped in, so partitions that no
+    longer have events (moved dates, removed rows) disappear and a failed
+    write leaves the previous dataset intact.
+    """
+    import shutil
+    import pyarrow.dataset as ds
+
+    table = to_event_table(pd.read_csv(csv_path))
+    tmp_dir = out_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    ds.write_dataset(table, tmp_dir, format="parquet", partitioning=["year", "month"],
+                     partitioning_flavor="hive")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return table.num_rows
+
+
+# ---------- READ ----------
+def _window_filter(start, end):
+    import pyarrow.dataset as ds
+
+    expr = None
+    if start is not None:
+        start = pd.Timestamp(start)
+        # partition keys let pyarrow skip whole files before reading any row
+        expr = (ds.field("year") > start.year) | ((ds.field("year") == start.year) & (ds.field("month") >= start.month))
+        expr &= ds.field("Date") >= start
+    if end is not None:
+        end = pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+        cond = (ds.field("year") < end.year) | ((ds.field("year") == end.year) & (ds.field("month") <= end.month))
+        cond &= ds.field("Date") <= end
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def load_events(columns=None, start=None, end=None, dataset_dir=EVENT_DATASET, csv_path=EVENT_CSV):
+    """Events dated in [start, end] (inclusive days) restricted to `columns`.
+
+    Reads the partitioned dataset when it exists and falls back to the CSV
+    otherwise. Returns compact_events output: embeddings is a float32 (n, dim)
+    matrix indexed by df[EMBEDDING_ROW], or None when not requested.
+    """
+    if columns is not None and "Date" not in columns:
+        columns = ["Date"] + list(columns)
+    want_embeddings = columns is None or EMBEDDING_COLUMN in columns
+    if os.path.isdir(dataset_dir):
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(dataset_dir, format="parquet", partitioning="hive")
+        table = dataset.to_table(columns=columns, filter=_window_filter(start, end))
+        embeddings = None
+        if want_embeddings and EMBEDDING_COLUMN in table.column_names:
+            emb = table.column(EMBEDDING_COLUMN).combine_chunks()
+            embeddings = emb.flatten().to_numpy().reshape(len(emb), emb.type.list_size)
+            table = table.drop_columns([EMBEDDING_COLUMN])
+        df = table.to_pandas()
+        df = df.drop(columns=[c for c in ("year", "month") if c in df.columns and (columns is None or c not in columns)])
+    else:
+        df = pd.read_csv(csv_path, usecols=columns)
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+        df = df.dropna(subset=["Date"])
+        if start is not None:
+            df = df[df["Date"] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df["Date"] < pd.Timestamp(end) + pd.Timedelta(days=1)]
+        embeddings = None
+        if want_embeddings and EMBEDDING_COLUMN in df.columns:
+            embeddings = np.array([json.loads(x) for x in df.pop(EMBEDDING_COLUMN)], dtype=np.float32)
+    return compact_events(df, embeddings)
+
+
+# ---------- COMPACTION ----------
+def _intern(series):
+    # equal strings parsed from CSV are separate objects; make every row share one copy
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    out = pd.Series(np.asarray(uniques, dtype=object)[codes], index=series.index, name=series.name)
+    return out.where(codes >= 0, None)
+
+
+def compact_events(df, embeddings=None, category_ratio=0.5):
+    """Shrinks an event frame in place of copies: returns (df, embeddings).
+
+    Embeddings held as list strings or per-row arrays move into one contiguous
+    float32 matrix that rows reference through EMBEDDING_ROW. Topic columns and
+    other low-cardinality text become categoricals, scores float32, and the
+    remaining text is interned so repeated strings are stored once.
+    """
+    df = df.reset_index(drop=True)
+    if EMBEDDING_COLUMN in df.columns:
+        raw = df.pop(EMBEDDING_COLUMN)
+        if embeddings is None:
+            embeddings = np.array([json.loads(x) if isinstance(x, str) else x for x in raw], dtype=np.float32)
+    for col in list(df.columns):
+        first = df[col].dropna().head(1)
+        if len(first) and isinstance(first.iloc[0], (list, np.ndarray)):
+            df = df.drop(columns=col)  # per-row array copies of the embedding
+    if embeddings is not None:
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        df[EMBEDDING_ROW] = np.arange(len(df), dtype=np.int32)
+    if "Date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["Date"]):
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    for col in df.columns:
+        s = df[col]
+        if col in FLOAT32_COLUMNS and pd.api.types.is_numeric_dtype(s):
+            df[col] = s.astype("float32")
+        elif col in CATEGORICAL_COLUMNS or (
+                pd.api.types.is_string_dtype(s) and not isinstance(s.dtype, pd.CategoricalDtype)
+                and s.nunique() <= category_ratio * len(s)):
+            df[col] = s.astype("category")
+        elif pd.api.types.is_object_dtype(s):
+            df[col] = _intern(s)
+    return df, embeddings
+
+
+def memory_report(df, embeddings=None):
+    """Deep memory per column (and the embedding matrix) in MiB, largest first."""
+    usage = df.memory_usage(deep=True, index=True)
+    rows = [{"column": str(col), "dtype": str(df[col].dtype) if col in df.columns else "index",
+             "MiB": usage[col] / 2**20} for col in usage.index]
+    if embeddings is not None:
+        rows.append({"column": "<embeddings>", "dtype": f"{embeddings.dtype}{list(embeddings.shape)}",
+                     "MiB": embeddings.nbytes / 2**20})
+    report = pd.DataFrame(rows).sort_values("MiB", ascending=False, ignore_index=True)
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ["report"]:
+        # usage: python event_store.py report [events.csv]
+        raw = pd.read_csv(sys.argv[2] if len(sys.argv) > 2 else EVENT_CSV)
+        before = memory_report(raw)
+        df, embeddings = compact_events(raw)
+        after = memory_report(df, embeddings)
+        print(after.to_string(index=False, float_format="{:.2f}".format))
+        print(f"\nRaw CSV frame: {before['MiB'].sum():.1f} MiB -> compact: {after['MiB'].sum():.1f} MiB "
+              f"({before['MiB'].sum() / after['MiB'].sum():.1f}x smaller)")
+    else:
+        rows = write_event_dataset(*sys.argv[1:3])
+        print(f"Wrote {rows} events to {sys.argv[2] if len(sys.argv) > 2 else EVENT_DATASET}")
@@ -0,0 +1,153 @@
+import os
+import re
+import time
+
+# Single-pass scanner for the Factiva PDF-to-text exports ("--- Page N ---"
+# markers, a table of contents on the leading pages, one article per TOC
+# entry). A file is tokenised once into page spans, TOC entries and article
+# spans with character offsets; article text is only materialised on request
+# and the date is looked for in the article's header lines, not its body.
+# Doc_ID is the Factiva accession number from the "Document <id>" line that
+# closes each article, the key every downstream CSV and dashboard uses.
+
+PAGE_MARKER = "--- Page "
+PAGE_RE = re.compile(r'--- Page \d+ ---\s*')
+HEADLINE_RE = re.compile(r'^(.+?)\.{10,}\s*(\d+)\s*$', re.UNICODE)
+DATE_RE = re.compile(
+    r'\b(\d{1,2}\s+(?:January|February|March|April|May|June|'
+    r'July|August|September|October|November|December)\s+\d{4})\b'
+)
+DOC_ID_MARKER = "\nDocument "
+DOC_ID_RE = re.compile(r'Document ([A-Za-z0-9]{10,})[ \t]*$', re.MULTILINE)
+HEADER_LINES = 15  # banner, headline, section, byline, word count, date, source ...
+SOURCE = "The Wall Street Journal"
+
+
+class Article:
+    __slots__ = ("index", "title", "first_page", "end_page", "start", "end", "date", "accession", "_document")
+
+    def __init__(self, document, index, title, first_page, end_page):
+        self._document = document
+        self.index, self.title = index, title
+        self.first_page, self.end_page = first_page, end_page
+        spans = document.page_spans
+        self.start = spans[first_page][0] if first_page < len(spans) else len(document.text)
+        self.end = spans[end_page - 1][1] if first_page < end_page <= len(spans) else self.start
+        self.date = document.find_date(first_page)
+        self.accession = document.find_accession(self.start, self.end)
+
+    @property
+    def content(self):
+        """Article pages joined with newlines (page markers removed), stripped."""
+        return self._document.pages_text(self.first_page, self.end_page)
+
+
+class FactivaDocument:
+    """Pages are numbered from 1; `page_spans[n]` is the (start, end) offset of page n's body."""
+
+    def __init__(self, text):
+        self.text = text
+        self.page_spans = [(0, 0)] + self._scan_pages(text)
+        self.toc = self._scan_toc()
+        self.articles = [
+            Article(self, idx, title, page, self.toc[idx + 1][1] if idx + 1 < len(self.toc) else len(self.page_spans))
+            for idx, (title, page) in enumerate(self.toc)]
+
+    @staticmethod
+    def _scan_pages(text):
+        # find() jumps straight to each marker; a ^-anchored MULTILINE regex
+        # would instead be tried at every position of the file
+        markers, pos = [], 0
+        while True:
+            i = text.find(PAGE_MARKER, pos)
+            if i < 0:
+                break
+            m = PAGE_RE.match(text, i) if i == 0 or text[i - 1] == "\n" else None
+            if m:
+                markers.append(m)
+            pos = i + len(PAGE_MARKER)
+        spans, prev_end = [], 0
+        for m in markers:
+            spans.append((prev_end, m.start()))
+            prev_end = m.end()
+        spans.append((prev_end, len(text)))
+        if not text[spans[0][0]:spans[0][1]].strip():
+            spans = spans[1:]  # nothing before the first marker
+        return spans
+
+    def page(self, number):
+        start, end = self.page_spans[number]
+        return self.text[start:end]
+
+    def pages_text(self, first, end):
+        return "\n".join(self.page(n) for n in range(first, min(end, len(self.page_spans)))).strip()
+
+    def _scan_toc(self):
+        toc = []
+        for number in range(1, len(self.page_spans)):
+            hits = [m for m in map(HEADLINE_RE.match, self.page(number).splitlines()) if m]
+            if not hits:
+                break
+            toc.extend((m.group(1).strip(), int(m.group(2))) for m in hits)
+        return toc
+
+    def find_date(self, page_number):
+        """First date in the header lines of the article starting on `page_number`."""
+        if not 0 < page_number < len(self.page_spans):
+            return ''
+        start, end = self.page_spans[page_number]
+        limit = start
+        for _ in range(HEADER_LINES):
+            limit = self.text.find("\n", limit, end) + 1
+            if limit == 0:
+                limit = end
+                break
+        m = DATE_RE.search(self.text, start, limit)
+        return m.group(1) if m else ''
+
+    def find_accession(self, start, end):
+        """Accession number on the first "Document <id>" line in [start, end), or ''.
+
+        The first one closes the titled article; a span can run on into
+        articles the table of contents does not list.
+        """
+        i = self.text.find(DOC_ID_MARKER, start, end)
+        m = DOC_ID_RE.match(self.text, i + 1, end) if i >= 0 else None
+        return m.group(1) if m else ''
+
+    def records(self, doc_prefix, source=SOURCE):
+        """Article dicts in the text_to_csv layout; Doc_ID falls back to `doc_prefix`-index without an accession number."""
+        return [{'Doc_ID': a.accession or f"{doc_prefix}-{a.index + 1:03d}", 'title': a.title, 'date': a.date,
+                 'source': source, 'content': a.content} for a in self.articles]
+
+
+def scan_file(path):
+    with open(path, encoding='utf-8') as f:
+        return FactivaDocument(f.read())
+
+
+# ---------- BENCHMARK ----------
+def benchmark(directory, repeat=3):
+    """Best-of-`repeat` throughput of scanning every .txt file and materialising all articles."""
+    paths = [os.path.join(directory, fn) for fn in sorted(os.listdir(directory)) if fn.lower().endswith('.txt')]
+    size = sum(os.path.getsize(p) for p in paths)
+    best, n_articles = float("inf"), 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n_articles = 0
+        for p in paths:
+            doc = scan_file(p)
+            n_articles += len(doc.records(os.path.splitext(os.path.basename(p))[0]))
+        best = min(best, time.perf_counter() - t0)
+    return {"files": len(paths), "MB": size / 1e6, "articles": n_articles, "seconds": best,
+            "MB_per_s": size / 1e6 / best, "articles_per_s": n_articles / best}
+
+
+if __name__ == "__main__":
+    import sys
+
+    # usage: python factiva.py [directory]
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "pdf_to_text data")
+    stats = benchmark(directory)
+    print(f"{stats['files']} files, {stats['MB']:.1f} MB, {stats['articles']} articles in {stats['seconds']:.3f} s "
+          f"-> {stats['MB_per_s']:.0f} MB/s, {stats['articles_per_s']:.0f} articles/s")
@@ -0,0 +1,220 @@
+import os
+import pandas as pd
+from tqdm import tqdm
+from sentence_transformers import SentenceTransformer, util
+from job_queue import JobQueue, run_workers
+from llm_json import CAUSAL_SUMMARY_SCHEMA, GOLD_SUMMARY_SCHEMA, OllamaUnavailable, extract_json
+from relevance_filter import (DEFAULT_KEYWORD_THRESHOLD, DEFAULT_SIMILARITY_THRESHOLD,
+                              PROTOTYPE_SENTENCE, prefilter_articles)
+
+# Script version of the final cell of gold_relvant_data_extraction.ipynb.
+# LLM answers are streamed and cut off once the JSON closes; malformed answers
+# get one repair attempt before the article is written to the bad-rows CSV.
+# With `prefilter` on, only gold-relevant paragraphs reach the LLM and articles
+# without any are scored as "no gold content" without an LLM call.
+# Every article (by Doc_ID) x prompt is a job in a SQLite queue next to the
+# output CSV, so an interrupted run picks up where it stopped when started
+# again, and a grown or edited input only adds the jobs that changed. Jobs that
+# ran out of attempts get a fresh set on each run, and a run stops without
+# using up attempts when ollama itself cannot be started or reached.
+
+NO_GOLD_SUMMARY = "No gold-related content found."
+LLM_TIMEOUT = 300  # seconds before a hung `ollama run` is killed and the job retried
+
+# --- Causal Gold Extraction Prompt ---
+def create_causal_prompt(article_content):
+    prompt_text = f"""
+You are a causal summarizer focused on the gold market.
+
+Here is a news article:
+---
+{article_content}
+---
+
+Task:
+- Analyze only gold-related parts.
+- Identify clear CAUSE (reason) and EFFECT (impact on gold prices, volatility, demand).
+- Extract clean cause-effect pairs.
+- Only output JSON with exact structure:
+
+{{
+  "gold_causal_summary": [
+    {{
+      "cause": "....",
+      "effect": "...."
+    }},
+    {{
+      "cause": "....",
+      "effect": "...."
+    }}
+  ]
+}}
+
+Notes:
+- If no gold-related causality found, output: {{"gold_causal_summary": []}}
+- No extra text, only valid JSON.
+"""
+    return prompt_text.strip()
+
+# --- General Gold Summary Prompt ---
+def create_general_prompt(article_content):
+    prompt_text = f"""
+You are a financial summarizer.
+
+Here is a news article:
+---
+{article_content}
+---
+
+Task:
+- Summarize briefly (2-3 sentences) any discussion related to GOLD: prices, futures, volatility, safe haven demand.
+- If no gold-related content found, output: {{"gold_summary": "{NO_GOLD_SUMMARY}"}}
+
+Output ONLY valid JSON:
+
+{{
+  "gold_summary": "...."
+}}
+"""
+    return prompt_text.strip()
+
+# --- Parse LLM JSON Outputs ---
+def extract_causal_pairs(model_name, article_content, timeout=LLM_TIMEOUT):
+    parsed = extract_json(model_name, create_causal_prompt(article_content), CAUSAL_SUMMARY_SCHEMA,
+                          timeout=timeout)
+    if parsed is None:
+        raise ValueError("causal extraction returned no valid JSON")
+    return parsed['gold_causal_summary']
+
+def extract_gold_summary(model_name, article_content, timeout=LLM_TIMEOUT):
+    parsed = extract_json(model_name, create_general_prompt(article_content), GOLD_SUMMARY_SCHEMA,
+                          timeout=timeout)
+    if parsed is None:
+        raise ValueError("gold summary returned no valid JSON")
+    return parsed['gold_summary'] or NO_GOLD_SUMMARY
+
+# --- Normalize Cosine Similarity ---
+def normalize_similarity(cos_sim):
+    norm = (cos_sim + 1) / 2  # map (-1,1) → (0,1)
+    scaled = 0.1 + 0.9 * norm # map (0,1) → (0.1,1.0)
+    return round(scaled, 4)
+
+# --- Single Article ---
+def build_result(causes, gold_general_summary, embed_model, proto_emb):
+    if causes:
+        cause_texts = [c['cause'] for c in causes]
+        effect_texts = [c['effect'] for c in causes]
+        joined_cause_effect = ["Cause: " + c['cause'] + " --> Effect: " + c['effect'] for c in causes]
+
+        cause_text = " || ".join(cause_texts)
+        effect_text = " || ".join(effect_texts)
+        cause_effect_summary = " || ".join(joined_cause_effect)
+    else:
+        cause_text = "No gold cause identified."
+        effect_text = "No gold effect identified."
+        cause_effect_summary = "No gold causality found."
+
+    # Fallback: if no summary but causes exist
+    causal_only = gold_general_summary == NO_GOLD_SUMMARY and bool(causes)
+    if causal_only:
+        gold_general_summary = f"This article discusses gold causally, mentioning: {', '.join(cause_texts)}."
+
+    general_emb = embed_model.encode(gold_general_summary, convert_to_numpy=True).tolist()
+    summary_emb = embed_model.encode(cause_effect_summary, convert_to_tensor=True)
+    relevance_score = normalize_similarity(util.cos_sim(summary_emb, proto_emb).item())
+
+    return {
+        'gold_cause': cause_text,
+        'gold_effect': effect_text,
+        'gold_cause_effect_summary': cause_effect_summary,
+        'gold_general_summary': gold_general_summary,
+        'gold_general_embedding': general_emb,
+        'gold_relevance_score': relevance_score,
+        'causal_only': causal_only,
+    }
+
+# --- Main Processor ---
+def enqueue_articles(df, queue, embed_model, prefilter, keyword_threshold, similarity_threshold):
+    """Jobs keyed on Doc_ID; safe to call on every run, since unchanged jobs are kept as they are."""
+    doc_ids = df['Doc_ID'].astype(str)
+    if doc_ids.duplicated().any():
+        raise ValueError(f"duplicate Doc_IDs in input: {doc_ids[doc_ids.duplicated()].unique()[:5].tolist()}")
+    contents = pd.Series(df['Content'].astype(str).to_numpy(), index=doc_ids)
+    if prefilter:
+        selection = prefilter_articles(contents, embed_model, keyword_threshold, similarity_threshold)
+        selection.index = contents.index
+        # dropped articles are settled as "no gold content" without an LLM call
+        dropped = selection.index[~selection['keep']]
+        queue.record([(doc_id, 'causal', None, []) for doc_id in dropped]
+                     + [(doc_id, 'summary', None, NO_GOLD_SUMMARY) for doc_id in dropped])
+        contents = selection.loc[selection['keep'], 'filtered_content']
+        print(f"Prefilter: {len(contents)}/{len(df)} articles sent to the LLM")
+    queue.enqueue((doc_id, task, content) for doc_id, content in contents.items() for task in ('causal', 'summary'))
+
+def materialize_results(df, queue, embed_model, proto_emb, output_csv):
+    done, failed = queue.results()
+    no_gold_result = build_result([], NO_GOLD_SUMMARY, embed_model, proto_emb)
+
+    results = {}
+    bad_rows = []
+    for idx, row in df.iterrows():
+        key = str(row['Doc_ID'])
+        tasks = done.get(key, {})
+        if key in failed:
+            print(f"⚠️ Warning: Skipping {key} due to error: {failed[key]}")
+            bad_rows.append(row)
+        elif len(tasks) == 2:
+            if tasks['causal'] == [] and tasks['summary'] == NO_GOLD_SUMMARY:
+                results[idx] = dict(no_gold_result)
+            else:
+                results[idx] = build_result(tasks['causal'], tasks['summary'], embed_model, proto_emb)
+        else:
+            print(f"⚠️ Warning: {key} has unfinished jobs; left out of {output_csv}")
+
+    good_df = df.loc[list(results)].copy()
+    good_df = good_df.join(pd.DataFrame.from_dict(results, orient='index'))
+    good_df.to_csv(output_csv, index=False)
+    print(f"\n✅ Finished processing. Output saved to {output_csv}")
+
+    if bad_rows:
+        bad_rows_df = pd.DataFrame(bad_rows)
+        bad_rows_output = output_csv.replace(".csv", "_bad_rows.csv")
+        bad_rows_df.to_csv(bad_rows_output, index=False)
+        print(f"\n🚨 Saved bad rows separately to {bad_rows_output}")
+
+def summarize_and_score(df, model_name, output_csv, prefilter=True,
+                        keyword_threshold=DEFAULT_KEYWORD_THRESHOLD,
+                        similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD,
+                        workers=2, queue_path=None):
+    embed_model = SentenceTransformer('all-MiniLM-L6-v2')
+    proto_emb = embed_model.encode(PROTOTYPE_SENTENCE, convert_to_tensor=True)
+
+    queue = JobQueue(queue_path or os.path.splitext(output_csv)[0] + "_jobs.sqlite")
+    if len(queue):
+        print(f"Resuming {queue.path}: {queue.counts()}")
+        retried = queue.retry_failed()
+        if retried:
+            print(f"Retrying {retried} failed jobs")
+    # always enqueued: new or edited articles are added, finished jobs are kept
+    enqueue_articles(df, queue, embed_model, prefilter, keyword_threshold, similarity_threshold)
+
+    handlers = {
+        'causal': lambda content: extract_causal_pairs(model_name, content),
+        'summary': lambda content: extract_gold_summary(model_name, content),
+    }
+    remaining = sum(n for state, n in queue.counts().items() if state != 'done')
+    with tqdm(total=remaining, desc="LLM jobs") as bar:
+        try:
+            run_workers(queue, handlers, workers=workers, progress=bar.update, abort_on=(OllamaUnavailable,))
+        except OllamaUnavailable as e:
+            print(f"❌ Stopped: ollama is unavailable ({e}); finished jobs are kept, run again once it is up")
+            return
+
+    materialize_results(df, queue, embed_model, proto_emb, output_csv)
+
+if __name__ == "__main__":
+    import sys
+    input_csv, output_csv = sys.argv[1], sys.argv[2]
+    model_name = sys.argv[3] if len(sys.argv) > 3 else "llama3.2"
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+    summarize_and_score(pd.read_csv(input_csv), model_name, output_csv, workers=workers)
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+# Indicator grids for parameter research. Cumulative sums (and sums of
+# squares / cross products) of the price and its returns are built once, and
+# every rolling indicator for every window length is a difference of two
+# prefix values, so a whole (dates x windows) grid costs one vectorised
+# subtraction. Results follow the pandas definitions used by add_indicators
+# (rolling(w) with min_periods=w, ddof=1 std, ewm(adjust=False)). Every row
+# depends only on the rows up to it, so appending prices leaves earlier rows
+# bit-for-bit unchanged.
+
+
+def _prefix(values):
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    total = np.zeros((len(values) + 1,) + values.shape[1:])
+    count = np.zeros_like(total)
+    np.cumsum(np.where(valid, values, 0.0), axis=0, out=total[1:])
+    np.cumsum(valid, axis=0, out=count[1:])
+    return total, count
+
+
+def _first_valid(values):
+    """First non-NaN value of each column (0 where there is none), a causal centring shift."""
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    first = np.take_along_axis(values, valid.argmax(axis=0)[None, ...], axis=0)[0]
+    return np.where(valid.any(axis=0), first, 0.0)
+
+
+def _window_diff(prefix, windows):
+    """(n, len(windows)) array of prefix[t + 1] - prefix[t + 1 - w]; NaN where the window starts before row 0."""
+    n = len(prefix) - 1
+    out = np.full((len(windows), n), np.nan)
+    for k, w in enumerate(windows):
+        if 0 < w <= n:
+            np.subtract(prefix[w:], prefix[:-w], out=out[k, w - 1:])
+    return out.T
+
+
+def _rolling_std(values, windows, ddof=1):
+    values = np.asarray(values, dtype=np.float64)
+    # centring keeps s2 - s^2/n stable; a whole-series mean would make old rows change with new data
+    centred = values - _first_valid(np.where(np.isfinite(values), values, np.nan))
+    total, count = _prefix(centred)
+    squares, _ = _prefix(centred * centred)
+    n = _window_diff(count, windows)
+    s, s2 = _window_diff(total, windows), _window_diff(squares, windows)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (s2 - s * s / n) / (n - ddof)
+    return np.where((n == np.asarray(windows)) & (n > ddof), np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+
+def ema(values, spans):
+    """(n, len(spans)) exponential moving averages, ewm(span=s, adjust=False) per column."""
+    from scipy.signal import lfilter  # scipy only loads once an EMA is asked for
+
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty((len(values), len(spans)))
+    for k, span in enumerate(spans):
+        alpha = 2.0 / (span + 1.0)
+        # y[t] = alpha * x[t] + (1 - alpha) * y[t-1], seeded so that y[0] = x[0]
+        out[:, k], _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * values[0]])
+    return out
+
+
+# ---------- GRID ----------
+class IndicatorGrid:
+    """Every indicator family for any list of window lengths over one price series.
+
+    Each method returns a (len(prices), len(windows)) float array whose column
+    k corresponds to windows[k].
+    """
+
+    def __init__(self, prices):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        delta = np.diff(self.prices, prepend=np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.pct_change = delta / np.r_[np.nan, self.prices[:-1]] * 100
+        # same as compute_RSI: the first (undefined) delta counts as 0 gain and 0 loss
+        self._gain, _ = _prefix(np.where(delta > 0, delta, 0.0))
+        self._loss, _ = _prefix(np.where(delta < 0, -delta, 0.0))
+        self._price_sum, _ = _prefix(self.prices)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def sma(self, windows):
+        with np.errstate(invalid="ignore"):
+            return _window_diff(self._price_sum, windows) / np.asarray(windows, dtype=np.float64)
+
+    def volatility(self, windows):
+        """Rolling std of percentage returns (the Volatility_<w> columns)."""
+        return _rolling_std(self.pct_change, windows)
+
+    def rsi(self, windows):
+        gain = _window_diff(self._gain, windows)
+        loss = _window_diff(self._loss, windows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return 100 - 100 / (1 + gain / loss)
+
+    def ema(self, spans):
+        return ema(self.prices, spans)
+
+    def macd(self, params):
+        """MACD and signal lines for (fast, slow, signal) triples; returns (macd, signal) grids."""
+        params = [tuple(p) for p in params]
+        spans = sorted({s for fast, slow, _ in params for s in (fast, slow)})
+        emas = dict(zip(spans, self.ema(spans).T))
+        macd = np.column_stack([emas[fast] - emas[slow] for fast, slow, _ in params])
+        signal = np.column_stack([ema(macd[:, k], [sig])[:, 0] for k, (_, _, sig) in enumerate(params)])
+        return macd, signal
+
+    def ma_corr(self, pairs, window=30):
+        """Rolling `window` correlation of SMA(a) with SMA(b) for (a, b) pairs."""
+        pairs = [tuple(p) for p in pairs]
+        windows = sorted({w for pair in pairs for w in pair})
+        mas = dict(zip(windows, self.sma(windows).T))
+        a = np.column_stack([mas[p] for p, _ in pairs])
+        b = np.column_stack([mas[q] for _, q in pairs])
+        both = ~(np.isnan(a) | np.isnan(b))
+        a, b = np.where(both, a, np.nan), np.where(both, b, np.nan)
+        a, b = a - _first_valid(a), b - _first_valid(b)
+        (sa, n), (sb, _) = _prefix(a), _prefix(b)
+        (saa, _), (sbb, _), (sab, _) = _prefix(a * a), _prefix(b * b), _prefix(a * b)
+
+        def win(prefix):
+            # one window length for every column: index prefix rows directly
+            end = np.arange(1, len(prefix))
+            start = end - window
+            out = prefix[end] - prefix[np.maximum(start, 0)]
+            out[start < 0] = np.nan
+            return out
+
+        n = win(n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = win(sab) - win(sa) * win(sb) / n
+            var_a = win(saa) - win(sa) ** 2 / n
+            var_b = win(sbb) - win(sb) ** 2 / n
+            corr = cov / np.sqrt(var_a * var_b)
+        return np.where(n == window, corr, np.nan)
+
+    # ---------- FRAMES ----------
+    def frame(self, ma_windows=(), vol_windows=(), rsi_windows=(), macd_params=(), corr_pairs=(),
+              corr_window=30, index=None):
+        """Named columns (MA_7, Volatility_30, RSI_14, MACD/Signal, MA_corr ...) for the requested grids."""
+        cols = {}
+        for prefix, windows, grid in (("MA", ma_windows, self.sma), ("Volatility", vol_windows, self.volatility),
+                                      ("RSI", rsi_windows, self.rsi)):
+            if windows:
+                cols.update({f"{prefix}_{w}": v for w, v in zip(windows, grid(list(windows)).T)})
+        if macd_params:
+            macd, signal = self.macd(macd_params)
+            for k, (fast, slow, sig) in enumerate(macd_params):
+                cols[f"MACD_{fast}_{slow}"] = macd[:, k]
+                cols[f"Signal_{fast}_{slow}_{sig}"] = signal[:, k]
+        if corr_pairs:
+            for (a, b), v in zip(corr_pairs, self.ma_corr(corr_pairs, corr_window).T):
+                cols[f"MA_corr_{a}_{b}"] = v
+        return pd.DataFrame(cols, index=index)
@@ -0,0 +1,169 @@
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# SQLite-backed queue of (article_id, task) jobs. Every state change is committed
+# as it happens, so a crashed or killed run resumes exactly where it stopped:
+# finished jobs keep their results and interrupted ones go back to pending.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    article_id TEXT NOT NULL,
+    task       TEXT NOT NULL,
+    payload    TEXT,
+    state      TEXT NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    result     TEXT,
+    error      TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (article_id, task)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, updated_at);
+"""
+
+
+class JobQueue:
+    def __init__(self, path, max_attempts=3, lease_seconds=900):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self):
+        # sqlite connections are per thread; WAL lets readers run beside the writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def enqueue(self, jobs):
+        """Adds (article_id, task, payload) jobs in one transaction.
+
+        Existing jobs with the same payload are left untouched, so enqueueing
+        the whole input again on resume only adds what is missing; a job whose
+        payload changed is reset to pending.
+        """
+        self._upsert(((str(a), t, json.dumps(p), "pending", None) for a, t, p in jobs))
+
+    def record(self, jobs):
+        """Stores (article_id, task, payload, result) jobs as already done (work settled without a worker)."""
+        self._upsert(((str(a), t, json.dumps(p), "done", json.dumps(r)) for a, t, p, r in jobs))
+
+    def _upsert(self, rows):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            "INSERT INTO jobs (article_id, task, payload, state, result, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (article_id, task) DO UPDATE SET payload = excluded.payload, state = excluded.state, "
+            "result = excluded.result, attempts = 0, error = NULL, updated_at = excluded.updated_at "
+            "WHERE payload IS NOT excluded.payload",
+            ((a, t, p, state, r, now) for a, t, p, state, r in rows))
+        conn.execute("COMMIT")
+
+    def claim(self):
+        """Atomically moves one runnable job to 'running'; returns (article_id, task, payload) or None.
+
+        Runnable means pending, failed with attempts left, or running past its
+        lease (a worker that died or hung).
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT article_id, task, payload FROM jobs "
+            "WHERE (state = 'pending' OR (state = 'failed' AND attempts < ?) "
+            "       OR (state = 'running' AND updated_at < ?)) "
+            "ORDER BY attempts, rowid LIMIT 1",
+            (self.max_attempts, now - self.lease_seconds)).fetchone()
+        if row is not None:
+            conn.execute("UPDATE jobs SET state = 'running', attempts = attempts + 1, updated_at = ? "
+                         "WHERE article_id = ? AND task = ?", (now, row[0], row[1]))
+        conn.execute("COMMIT")
+        return None if row is None else (row[0], row[1], json.loads(row[2]))
+
+    def complete(self, article_id, task, result):
+        self._conn().execute(
+            "UPDATE jobs SET state = 'done', result = ?, error = NULL, updated_at = ? "
+            "WHERE article_id = ? AND task = ?", (json.dumps(result), time.time(), article_id, task))
+
+    def fail(self, article_id, task, error):
+        self._conn().execute(
+            "UPDATE jobs SET state = 'failed', error = ?, updated_at = ? "
+            "WHERE article_id = ? AND task = ?", (str(error), time.time(), article_id, task))
+
+    def release(self, article_id, task, error=None):
+        """Puts a claimed job back to pending without counting the attempt."""
+        self._conn().execute(
+            "UPDATE jobs SET state = 'pending', attempts = MAX(attempts - 1, 0), error = ?, updated_at = ? "
+            "WHERE article_id = ? AND task = ?", (error and str(error), time.time(), article_id, task))
+
+    def retry_failed(self):
+        """Gives every failed job a fresh set of attempts; returns how many were reset."""
+        return self._conn().execute("UPDATE jobs SET state = 'pending', attempts = 0, updated_at = ? "
+                                    "WHERE state = 'failed'", (time.time(),)).rowcount
+
+    def requeue_running(self):
+        """Puts jobs left 'running' by a previous process back to pending (call before starting workers)."""
+        self._conn().execute("UPDATE jobs SET state = 'pending', attempts = MAX(attempts - 1, 0) "
+                             "WHERE state = 'running'")
+
+    def counts(self):
+        return dict(self._conn().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+
+    def results(self):
+        """{article_id: {task: result}} for finished jobs, plus {article_id: error} for exhausted ones."""
+        done, failed = {}, {}
+        rows = self._conn().execute("SELECT article_id, task, state, attempts, result, error FROM jobs")
+        for article_id, task, state, attempts, result, error in rows:
+            if state == 'done':
+                done.setdefault(article_id, {})[task] = json.loads(result)
+            elif state == 'failed' and attempts >= self.max_attempts:
+                failed[article_id] = f"{task}: {error}"
+        return done, failed
+
+
+def run_workers(queue, handlers, workers=2, progress=None, abort_on=()):
+    """Runs `handlers[task](payload)` for every claimable job on `workers` threads.
+
+    Each result is committed as soon as it is returned, so stopping the
+    process at any point loses at most the jobs in flight. An exception of a
+    type in `abort_on` (the backend itself is down) puts the job back without
+    counting the attempt, stops every worker and is re-raised.
+    """
+    queue.requeue_running()
+    aborted = []
+
+    def work():
+        while not aborted:
+            job = queue.claim()
+            if job is None:
+                return
+            article_id, task, payload = job
+            try:
+                queue.complete(article_id, task, handlers[task](payload))
+            except abort_on as e:
+                queue.release(article_id, task, e)
+                aborted.append(e)
+                return
+            except Exception as e:
+                print(f"⚠️ Warning: job {task} for article {article_id} failed: {e}")
+                queue.fail(article_id, task, e)
+            if progress is not None:
+                progress()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(work) for _ in range(workers)]:
+            future.result()
+    if aborted:
+        raise aborted[0]
@@ -0,0 +1,198 @@
+import codecs
+import json
+import re
+import subprocess
+import tempfile
+import threading
+
+# ---------- SCHEMAS ----------
+# A dict maps required keys to schemas, a one-item list means "list of", a type is a leaf.
+ARTICLE_SCHEMA = {"title": str, "date": str, "source": str, "content": str}
+GOLD_SUMMARY_SCHEMA = {"gold_summary": str}
+CAUSAL_SUMMARY_SCHEMA = {"gold_causal_summary": [{"cause": str, "effect": str}]}
+
+
+def validate(obj, schema, path="$"):
+    """Returns a list of human-readable problems; empty when `obj` matches `schema`."""
+    if isinstance(schema, dict):
+        if not isinstance(obj, dict):
+            return [f"{path} must be an object"]
+        problems = []
+        for key, sub in schema.items():
+            if key not in obj:
+                problems.append(f"{path} is missing \"{key}\"")
+            else:
+                problems.extend(validate(obj[key], sub, f"{path}.{key}"))
+        return problems
+    if isinstance(schema, list):
+        if not isinstance(obj, list):
+            return [f"{path} must be an array"]
+        return [p for i, item in enumerate(obj) for p in validate(item, schema[0], f"{path}[{i}]")]
+    if not isinstance(obj, schema):
+        return [f"{path} must be a {schema.__name__}"]
+    return []
+
+
+def schema_example(schema):
+    if isinstance(schema, dict):
+        return {key: schema_example(sub) for key, sub in schema.items()}
+    if isinstance(schema, list):
+        return [schema_example(schema[0])]
+    return "..."
+
+
+# ---------- INCREMENTAL SCANNER ----------
+_SPECIAL = re.compile(r'["\\{}]')
+
+
+class JsonObjectScanner:
+    """Finds the first complete top-level JSON object in text fed chunk by chunk.
+
+    Only quotes, backslashes and braces are inspected, so text before the
+    object and inside strings is skipped without per-character Python work.
+    """
+
+    def __init__(self):
+        self.text = None
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        if self.text is not None:
+            return self.text
+        if self._depth == 0:
+            start = chunk.find("{")
+            if start < 0:
+                return None
+            chunk = chunk[start:]
+        pos = 0
+        while True:
+            if self._escape:
+                if pos >= len(chunk):
+                    break
+                self._escape = False
+                pos += 1
+            m = _SPECIAL.search(chunk, pos)
+            if not m:
+                break
+            ch, pos = m.group(), m.end()
+            if self._in_string:
+                if ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[:pos])
+                    self.text = "".join(self._parts)
+                    return self.text
+        self._parts.append(chunk)
+        return None
+
+
+def find_json_object(text):
+    """First balanced JSON object in `text`, or None (replaces the greedy `{.*}` regex)."""
+    return JsonObjectScanner().feed(text or "")
+
+
+def parse_and_validate(json_text, schema):
+    """Returns (parsed, problems)."""
+    if json_text is None:
+        return None, ["no complete JSON object found in the output"]
+    try:
+        parsed = json.loads(json_text)
+    except json.JSONDecodeError as e:
+        return None, [f"invalid JSON: {e.msg} at position {e.pos}"]
+    return parsed, validate(parsed, schema)
+
+
+# ---------- STREAMING OLLAMA RUNNER ----------
+class OllamaUnavailable(RuntimeError):
+    """`ollama run` could not be started or exited with an error before answering."""
+
+
+def stream_ollama_json(model_name, prompt_text, timeout=None):
+    """Runs `ollama run` and stops generation as soon as the first JSON object closes.
+
+    A run still going after `timeout` seconds is killed. Returns (json_text or None, raw_output);
+    raises OllamaUnavailable when ollama fails without producing any output.
+    """
+    command = ['ollama', 'run', model_name]
+    with tempfile.TemporaryFile() as stderr:
+        try:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr)
+        except OSError as e:
+            raise OllamaUnavailable(f"could not start ollama: {e}") from e
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        scanner = JsonObjectScanner()
+        raw = []
+        watchdog = threading.Timer(timeout, process.kill) if timeout else None
+        if watchdog:
+            watchdog.start()
+        try:
+            try:
+                process.stdin.write(prompt_text.encode('utf-8'))
+                process.stdin.close()
+            except BrokenPipeError:
+                pass  # ollama exited before reading the prompt; its exit code says why
+            while scanner.text is None:
+                chunk = process.stdout.read1(4096)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                raw.append(text)
+                scanner.feed(text)
+        finally:
+            if watchdog:
+                watchdog.cancel()
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+
+        if scanner.text is None and process.returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode('utf-8', errors='replace').strip()
+            # an error exit with no output (server down, unknown model); a kill by the watchdog is a signal
+            if process.returncode > 0 and not "".join(raw).strip():
+                raise OllamaUnavailable(message or f"ollama exited with code {process.returncode}")
+            print(f"Error: {message}")
+    return scanner.text, "".join(raw)
+
+
+def create_repair_prompt(prompt_text, bad_output, problems, schema):
+    issues = "\n".join(f"- {p}" for p in problems)
+    return f"""{prompt_text}
+
+Your previous answer could not be used:
+{issues}
+
+Previous answer:
+{bad_output.strip()[:2000]}
+
+Reply again with ONLY valid JSON in exactly this structure:
+{json.dumps(schema_example(schema), indent=2)}
+"""
+
+
+def extract_json(model_name, prompt_text, schema, max_repairs=1, timeout=None):
+    """Streams a JSON answer and validates it against `schema`.
+
+    Retries with a repair prompt only when parsing or validation fails.
+    Returns the parsed object, or None once the repairs are exhausted.
+    """
+    prompt = prompt_text
+    for _ in range(max_repairs + 1):
+        json_text, raw = stream_ollama_json(model_name, prompt, timeout=timeout)
+        parsed, problems = parse_and_validate(json_text, schema)
+        if not problems:
+            return parsed
+        prompt = create_repair_prompt(prompt_text, raw, problems, schema)
+    print(f"Error: JSON output still invalid after {max_repairs} repair(s): {'; '.join(problems)}")
+    return None
@@ -1,12 +1,9 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
-import numpy as np
-import yfinance as yf
-import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.decomposition import PCA
-from scipy.signal import find_peaks
-import ast, os
+from event_explorer import explorer_html
+from query_service import QueryState, frame_from_json, query
+from startup_artifacts import extrema_profile
 
 st.set_page_config(layout="wide", page_title="Commodity Event Intelligence")
 
@@ -18,72 +15,45 @@ st.divider()
 # ============ SCENARIO 1 : 3D EVENT EMBEDDINGS ============
 st.subheader("🪙 Scenario-1 — 3D Visualization of Gold News Articles Over Time")
 
-@st.cache_data
-def load_event_data():
-    base_dir = os.path.dirname(__file__)
-    path = os.path.join(base_dir, "causal_gold_articles_with_topics_bert.csv")
-    df = pd.read_csv(path)
-    df["embedding"] = df["gold_general_embedding"].apply(lambda x: np.array(ast.literal_eval(x)))
-    embeddings = np.vstack(df["embedding"].values)
-    reduced = PCA(n_components=3).fit_transform(embeddings)
-    df["x"], df["y"], df["z"] = reduced[:, 0], reduced[:, 1], reduced[:, 2]
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    return df.dropna(subset=["Date"])
-
-df_events = load_event_data()
-
-# ---- Date selection ----
-min_d, max_d = df_events["Date"].min().date(), df_events["Date"].max().date()
-col1, col2 = st.columns(2)
-start_date = col1.date_input("Start Date", min_d, min_value=min_d, max_value=max_d)
-end_date = col2.date_input("End Date", max_d, min_value=min_d, max_value=max_d)
-
-mask = (df_events["Date"].dt.date >= start_date) & (df_events["Date"].dt.date <= end_date)
-filtered_events = df_events[mask]
-
-fig1 = px.scatter_3d(
-    filtered_events, x="x", y="y", z="z",
-    color="assigned_topic",
-    hover_name="Headline",
-    hover_data={
-        "Doc_ID": True,
-        "gold_relevance_score": True,
-        "topic_similarity": True,
-        "assigned_topic": True,
-        "Date": True,
-    },
-    title=f"3D Projection of News Articles ({start_date} → {end_date})"
-)
-fig1.update_layout(scene=dict(xaxis_title="PCA1", yaxis_title="PCA2", zaxis_title="PCA3"),
-                   margin=dict(l=0, r=0, b=0, t=40))
+# Prices, events and their PCA projection live in the query service; without a
+# running service the same state is built once per process.
+@st.cache_resource
+def local_state():
+    return QueryState()
+
+bounds = query("date_bounds", fallback=local_state)
 
-st.plotly_chart(fig1, use_container_width=True, height=700)
-st.markdown(f"**{len(filtered_events)}** articles displayed for the selected range.")
+# The explorer page is built once; date and topic filtering then run in the browser.
+@st.cache_data
+def load_event_explorer():
+    events = frame_from_json(query(
+        "events", fallback=local_state,
+        columns="Doc_ID,Headline,assigned_topic,gold_relevance_score,topic_similarity,x,y,z"))
+    return explorer_html(events, color="assigned_topic",
+                         hover_columns=["Doc_ID", "gold_relevance_score", "topic_similarity"], height=700)
+
+components.html(load_event_explorer(), height=760)
 st.divider()
 
 # ============ SCENARIO 2 : TIME SERIES ============
 st.subheader("🏆 Scenario-2 — Gold Futures Quantile & Peaks with Interactive Window")
-
-@st.cache_data
-def load_gold_futures():
-    df = yf.download("GC=F", start="2000-01-01", progress=False)
-    df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
-    df.reset_index(inplace=True)
-    df.rename(columns={"Close": "Price"}, inplace=True)
-    df["Price"] = pd.to_numeric(df["Price"], errors="coerce")
-    return df.dropna(subset=["Price"])
-
-df_fut = load_gold_futures()
-df_fut["Q25"] = df_fut["Price"].rolling(30).quantile(0.25)
-df_fut["Q50"] = df_fut["Price"].rolling(30).quantile(0.5)
-df_fut["Q75"] = df_fut["Price"].rolling(30).quantile(0.75)
-df_fut["Pct_Change"] = df_fut["Price"].pct_change() * 100
-peaks, _ = find_peaks(df_fut["Price"].to_numpy().flatten(), distance=5, prominence=5)
+import plotly.graph_objects as go  # imported once Scenario-1 is on screen
+
+# restored from startup_artifacts when they match these prices, so scipy only loads otherwise
+@st.cache_resource
+def load_extrema_profile(prices):
+    return extrema_profile(prices)
+
+df_fut = frame_from_json(query("prices", fallback=local_state, columns="Price,Q25,Q50,Q75,Pct_Change"))
+col5, col6 = st.columns(2)
+prominence = col5.slider("Peak Prominence (USD)", 1.0, 100.0, 5.0, step=1.0)
+distance = col6.slider("Min Peak Distance (days)", 1, 60, 5)
+peaks, _ = load_extrema_profile(df_fut["Price"].to_numpy().flatten()).select(distance, prominence)
 df_fut["is_peak"] = False
 df_fut.loc[df_fut.index[peaks], "is_peak"] = True
 
 # Date range controls
-min_d2, max_d2 = df_fut["Date"].min().date(), df_fut["Date"].max().date()
+min_d2, max_d2 = [pd.Timestamp(d).date() for d in bounds["prices"]]
 col3, col4 = st.columns(2)
 start2 = col3.date_input("Start Date (Futures)", min_d2, min_value=min_d2, max_value=max_d2)
 end2 = col4.date_input("End Date (Futures)", max_d2, min_value=min_d2, max_value=max_d2)
@@ -121,11 +91,13 @@ st.plotly_chart(fig2, use_container_width=True, height=700)
 
 # Summary
 st.markdown("### 📊 Summary for Selected Window")
-summary = filt_fut.tail(30)
+summary = query("window_stats", fallback=local_state, start=start2, end=end2)
+# the JSON snapshot sends NaN (e.g. the std of a one-day window) as null; show it as nan
+summary = {k: float("nan") if v is None else v for k, v in summary.items()}
 colA, colB, colC = st.columns(3)
-colA.metric("Latest Price", f"{summary['Price'].iloc[-1]:,.2f}")
-colB.metric("30-Day Mean", f"{summary['Price'].mean():,.2f}")
-colC.metric("Volatility (%)", f"{summary['Pct_Change'].std():.2f}")
+colA.metric("Latest Price", f"{summary['latest_price']:,.2f}")
+colB.metric("30-Day Mean", f"{summary['tail_mean_price']:,.2f}")
+colC.metric("Volatility (%)", f"{summary['tail_pct_change_std']:.2f}")
 
 st.markdown(
     f"<p style='text-align:center;color:gold;'>Highlighted window: "
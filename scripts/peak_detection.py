@@ -0,0 +1,210 @@
+import math
+import numpy as np
+
+
+# ---------- DISTANCE RULE ----------
+def _select_by_distance(positions, priority, distance):
+    """Same rule as find_peaks(distance=...): higher-priority extrema suppress
+    every neighbour closer than `distance` bars. Exact ties go to the later
+    extremum (find_peaks' unstable sort leaves their order arbitrary), so the
+    result does not depend on which other extrema are in the array."""
+    keep = np.ones(len(positions), dtype=bool)
+    distance = math.ceil(distance)
+    for j in np.argsort(priority, kind="stable")[::-1]:
+        if not keep[j]:
+            continue
+        k = j - 1
+        while k >= 0 and positions[j] - positions[k] < distance:
+            keep[k] = False
+            k -= 1
+        k = j + 1
+        while k < len(positions) and positions[k] - positions[j] < distance:
+            keep[k] = False
+            k += 1
+    return keep
+
+
+# ---------- PROMINENCE PROFILE ----------
+class ExtremaProfile:
+    """Every local peak and trough of a price series with its prominence.
+
+    Built with one `find_peaks` pass per side. `select` then reproduces
+    `detect_peaks_troughs(series, distance, prominence)` from the stored
+    profile, so moving a threshold slider never rescans the history.
+    `profile` restores a saved (peaks, troughs, peak_prominences,
+    trough_prominences) for the same series without importing scipy.
+    """
+
+    def __init__(self, series, profile=None):
+        x = np.asarray(series, dtype=float).ravel()
+        if profile is None:
+            from scipy.signal import find_peaks, peak_prominences
+
+            peaks, troughs = find_peaks(x)[0], find_peaks(-x)[0]
+            profile = (peaks, troughs, peak_prominences(x, peaks)[0], peak_prominences(-x, troughs)[0])
+        self.peaks, self.troughs, self.peak_prominences, self.trough_prominences = map(np.asarray, profile)
+        self._heights = {"peak": x[self.peaks], "trough": -x[self.troughs]}
+        self._distance_masks = {}
+
+    def _distance_mask(self, kind, distance):
+        key = (kind, distance)
+        if key not in self._distance_masks:
+            positions = self.peaks if kind == "peak" else self.troughs
+            self._distance_masks[key] = _select_by_distance(positions, self._heights[kind], distance)
+        return self._distance_masks[key]
+
+    def select(self, distance=5, prominence=5):
+        peak_keep = self.peak_prominences >= prominence
+        trough_keep = self.trough_prominences >= prominence
+        if distance is not None:
+            peak_keep &= self._distance_mask("peak", distance)
+            trough_keep &= self._distance_mask("trough", distance)
+        return self.peaks[peak_keep], self.troughs[trough_keep]
+
+
+# ---------- STREAMING DETECTOR ----------
+class _OnlineMaxima:
+    """Local maxima of a stream, each settled once its prominence verdict is known.
+
+    Prominence only grows while a peak's right side keeps falling and is final
+    once a higher bar arrives, so a maximum qualifies as soon as it clears the
+    threshold and fails if it is overtaken first. The left base comes from a
+    monotonic stack, which keeps each update amortised O(1).
+    """
+
+    def __init__(self, prominence):
+        self.prominence = prominence
+        self.t = 0
+        self.qualified = {}   # index -> prominence, for maxima that reached the threshold
+        self.open = {}        # index -> [value, left_min, right_min], verdict still pending
+        self._stack = []      # [value, min of bars between previous entry and this one]
+        self._prev = None
+        self.plateau_start = None
+        self._plateau_left_min = None
+
+    def settled(self, idx):
+        return idx not in self.open
+
+    def forget(self, idx):
+        self.open.pop(idx, None)
+        self.qualified.pop(idx, None)
+
+    def _check(self, idx, v, left_min, right_min):
+        prom = v - max(left_min, right_min)
+        if prom >= self.prominence:
+            self.qualified[idx] = prom
+            return True
+        return False
+
+    def update(self, x):
+        """Feed one bar; returns the local maxima it revealed as (index, value)."""
+        for idx, cand in list(self.open.items()):
+            v, left_min, right_min = cand
+            if x > v:
+                del self.open[idx]  # overtaken: prominence is final and below the threshold
+            else:
+                cand[2] = min(right_min, x)
+                if self._check(idx, *cand):
+                    del self.open[idx]
+
+        acc = math.inf
+        while self._stack and self._stack[-1][0] <= x:
+            v, seg_min = self._stack.pop()
+            acc = min(acc, v, seg_min)
+        self._stack.append([x, acc])
+
+        found = []
+        prev = self._prev
+        if prev is not None:
+            if x > prev:
+                self.plateau_start = self.t
+                self._plateau_left_min = min(acc, x)
+            elif x < prev and self.plateau_start is not None:
+                idx = (self.plateau_start + self.t - 1) // 2
+                found.append((idx, prev))
+                if not self._check(idx, prev, self._plateau_left_min, x):
+                    self.open[idx] = [prev, self._plateau_left_min, x]
+                self.plateau_start = None
+        self._prev = x
+        self.t += 1
+        return found
+
+    def next_maximum_bound(self):
+        """Smallest index any maximum revealed later can have."""
+        return self.plateau_start if self.plateau_start is not None else self.t
+
+
+class StreamingExtremaDetector:
+    """Online peak/trough detector for bars arriving one at a time.
+
+    Gives the same extrema as `find_peaks(distance=..., prominence=...)` on
+    the full history, each released on the first bar that settles it. Local
+    maxima closer than `distance` bars form a chain; once no later maximum
+    can join the chain, the distance rule is applied to it exactly as
+    find_peaks does, and each survivor is released when its prominence
+    reaches `prominence` (or dropped if a higher bar comes first). `flush`
+    settles the open chain at the end of the data.
+    """
+
+    def __init__(self, prominence=5, distance=5):
+        self.distance = math.ceil(distance) if distance else 1
+        self._sides = {"peak": _OnlineMaxima(prominence), "trough": _OnlineMaxima(prominence)}
+        self._chain = {"peak": [], "trough": []}     # (index, value) of the open chain
+        self._waiting = {"peak": [], "trough": []}   # distance survivors awaiting their prominence verdict
+        self.peaks, self.troughs = [], []
+
+    def _close(self, kind):
+        chain, side = self._chain[kind], self._sides[kind]
+        positions = np.array([idx for idx, _ in chain])
+        keep = _select_by_distance(positions, np.array([v for _, v in chain]), self.distance)
+        for idx, kept in zip(positions.tolist(), keep):
+            if kept:
+                self._waiting[kind].append(idx)
+            else:
+                side.forget(idx)
+        chain.clear()
+
+    def _release(self, kind):
+        side = self._sides[kind]
+        accepted = self.peaks if kind == "peak" else self.troughs
+        released, waiting = [], []
+        for idx in self._waiting[kind]:
+            if idx in side.qualified:
+                accepted.append(idx)
+                released.append((kind, idx, side.qualified.pop(idx)))
+            elif not side.settled(idx):
+                waiting.append(idx)
+        self._waiting[kind] = waiting
+        return released
+
+    def update(self, price):
+        """Feed one bar; returns the extrema released by it as (kind, index, prominence)."""
+        price = float(price)
+        events = []
+        for kind, x in (("peak", price), ("trough", -price)):
+            side, chain = self._sides[kind], self._chain[kind]
+            for idx, v in side.update(x):
+                if chain and idx - chain[-1][0] >= self.distance:
+                    self._close(kind)
+                chain.append((idx, v))
+            if chain and side.next_maximum_bound() - chain[-1][0] >= self.distance:
+                self._close(kind)
+            events.extend(self._release(kind))
+        return events
+
+    def flush(self):
+        """Settles the open chains as if the data ended here (what find_peaks sees)."""
+        events = []
+        for kind in ("peak", "trough"):
+            if self._chain[kind]:
+                self._close(kind)
+            events.extend(self._release(kind))
+        return events
+
+    def extend(self, prices):
+        """Feeds many bars; returns (kind, index, prominence, bar it was released on)."""
+        events = []
+        for price in np.asarray(prices, dtype=float).ravel():
+            bar = self._sides["peak"].t
+            events.extend(e + (bar,) for e in self.update(price))
+        return events
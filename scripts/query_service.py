@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from startup_artifacts import FAST_START, event_projection, load_prices
+
+# Local HTTP query service: one process holds the price frame, indicators,
+# event store and PCA projection in memory, and every Streamlit page asks it
+# for the slice it needs instead of loading and recomputing its own copy.
+#
+#   python query_service.py [port]
+#
+# Pages call `query(endpoint, fallback=..., **params)`; when the service is
+# not running the same QueryState method is evaluated in-process instead;
+# errors from a running service are raised, not recomputed locally. After new
+# prices or events, GET /reload rebuilds the state and empties the cache.
+# With EVENT_FAST_START=1 the state comes from startup_artifacts (saved
+# prices, extrema and PCA components) instead of being fetched and refitted.
+
+DEFAULT_PORT = 8765
+SERVICE_URL = os.environ.get("EVENT_QUERY_URL", f"http://127.0.0.1:{DEFAULT_PORT}")
+EVENT_COLUMNS = ["Doc_ID", "Headline", "assigned_topic", "assigned_topic_bert", "topic_similarity",
+                 "gold_relevance_score", "gold_cause", "gold_effect"]
+
+
+def _columns_json(df):
+    """Column-oriented JSON-able dict; datetimes become ISO strings, NaN becomes None."""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            out[col] = s.dt.strftime("%Y-%m-%d").tolist()
+        elif pd.api.types.is_float_dtype(s):
+            out[col] = [None if v != v else v for v in s.astype("float64").tolist()]
+        else:
+            out[col] = s.astype(object).where(s.notna(), None).tolist()
+    return out
+
+
+def frame_from_json(columns):
+    df = pd.DataFrame(columns)
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+# ---------- SHARED STATE ----------
+class QueryState:
+    """Everything the dashboards read, loaded once. Methods return JSON-able values."""
+
+    def __init__(self, ticker="GC=F", start="2000-01-01", fast=FAST_START):
+        from event_store import EVENT_CSV, EVENT_DATASET, load_events
+        from indicators import IndicatorGrid
+        from range_stats import RangeStats
+
+        # fast start reads the saved frame; yfinance/scipy are only imported to rebuild it
+        prices = load_prices(ticker, start) if fast else None
+        if prices is None:
+            from utils import add_indicators, add_quantiles, load_futures
+            prices = add_quantiles(add_indicators(load_futures(ticker, start=start)))
+        self.prices = prices.reset_index(drop=True)
+        self.price_stats = RangeStats(self.prices)
+        self.indicator_grid = IndicatorGrid(self.prices["Price"])
+
+        self.events = pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]")})
+        self._unit_embeddings = np.empty((0, 0), dtype=np.float32)
+        if os.path.isdir(EVENT_DATASET) or os.path.exists(EVENT_CSV):
+            events, embeddings = load_events()
+            keep = [c for c in EVENT_COLUMNS if c in events.columns]
+            self.events = events[["Date"] + keep].reset_index(drop=True)
+            reduced = event_projection(embeddings, fast=fast)
+            self.events["x"], self.events["y"], self.events["z"] = reduced[:, 0], reduced[:, 1], reduced[:, 2]
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            self._unit_embeddings = (embeddings / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+    def _window(self, frame, start, end):
+        mask = np.ones(len(frame), dtype=bool)
+        if start:
+            mask &= (frame["Date"] >= pd.Timestamp(start)).to_numpy()
+        if end:
+            mask &= (frame["Date"] < pd.Timestamp(end) + pd.Timedelta(days=1)).to_numpy()
+        return frame[mask]
+
+    def prices_in_range(self, start=None, end=None, columns=None):
+        cols = ["Date"] + [c for c in (columns.split(",") if columns else self.prices.columns) if c != "Date"]
+        return _columns_json(self._window(self.prices, start, end)[cols])
+
+    def date_bounds(self):
+        def bounds(frame):
+            if frame.empty:
+                return None
+            return [frame["Date"].min().strftime("%Y-%m-%d"), frame["Date"].max().strftime("%Y-%m-%d")]
+        return {"prices": bounds(self.prices), "events": bounds(self.events)}
+
+    def window_stats(self, start=None, end=None):
+        return self.price_stats.snapshot(start, end)
+
+    def window_stats_batch(self, starts, ends):
+        """Snapshots for many windows; `starts` / `ends` are comma-separated dates."""
+        return _columns_json(self.price_stats.snapshots(starts.split(","), ends.split(",")))
+
+    def indicators(self, family, windows, start=None, end=None):
+        """Indicator columns for comma-separated `windows`; family is ma, volatility or rsi."""
+        windows = [int(w) for w in windows.split(",")]
+        grids = {"ma": "ma_windows", "volatility": "vol_windows", "rsi": "rsi_windows"}
+        if family not in grids:
+            raise ValueError(f"unknown indicator family {family!r}")
+        frame = self.indicator_grid.frame(**{grids[family]: windows}, index=self.prices.index)
+        frame.insert(0, "Date", self.prices["Date"])
+        return _columns_json(self._window(frame, start, end))
+
+    def events_in_range(self, start=None, end=None, columns=None):
+        cols = ["Date"] + [c for c in (columns.split(",") if columns else self.events.columns)
+                           if c != "Date" and c in self.events.columns]
+        return _columns_json(self._window(self.events, start, end)[cols])
+
+    def similar_events(self, row, k=10):
+        row, k = int(row), int(k)
+        sims = self._unit_embeddings @ self._unit_embeddings[row]
+        top = np.argpartition(-sims, min(k, len(sims) - 1))[:k + 1]
+        top = [i for i in top[np.argsort(-sims[top])] if i != row][:k]
+        out = self.events.iloc[top][["Date"] + [c for c in ("Doc_ID", "Headline") if c in self.events.columns]]
+        out = out.assign(similarity=sims[top])
+        return _columns_json(out)
+
+    def topic_counts(self, start=None, end=None, column="assigned_topic_bert"):
+        window = self._window(self.events, start, end)
+        if column not in window.columns:
+            return {}
+        return {str(k): int(v) for k, v in window[column].value_counts().items() if v > 0}
+
+
+ENDPOINTS = {
+    "/date_bounds": "date_bounds",
+    "/prices": "prices_in_range",
+    "/window_stats": "window_stats",
+    "/window_stats_batch": "window_stats_batch",
+    "/indicators": "indicators",
+    "/events": "events_in_range",
+    "/similar_events": "similar_events",
+    "/topic_counts": "topic_counts",
+}
+
+
+# ---------- SERVER ----------
+class QueryServer:
+    """Serves a QueryState over HTTP with an LRU cache of response bodies.
+
+    The cache is bounded by entry count and total bytes, and cleared when
+    /reload swaps in a freshly built state.
+    """
+
+    def __init__(self, state, cache_size=512, cache_bytes=256 * 2**20, state_factory=None):
+        self.state = state
+        self.state_factory = state_factory or QueryState
+        self.cache_size, self.cache_bytes = cache_size, cache_bytes
+        self.generation = 0
+        self._cache = OrderedDict()
+        self._cache_used = 0
+
+    def _remember(self, key, body):
+        self._cache[key] = body
+        self._cache_used += len(body)
+        while self._cache and (len(self._cache) > self.cache_size or self._cache_used > self.cache_bytes):
+            _, old = self._cache.popitem(last=False)
+            self._cache_used -= len(old)
+
+    async def reload(self):
+        """Rebuilds the state off the event loop; queries keep using the old one until the swap."""
+        state = await asyncio.to_thread(self.state_factory)
+        self.state, self.generation = state, self.generation + 1
+        self._cache.clear()
+        self._cache_used = 0
+
+    async def _answer(self, path, params):
+        if path == "/health":
+            return 200, b'{"status": "ok"}'
+        if path == "/reload":
+            await self.reload()
+            return 200, json.dumps({"status": "reloaded", "generation": self.generation}).encode()
+        method = ENDPOINTS.get(path)
+        if method is None:
+            return 404, json.dumps({"error": f"unknown endpoint {path}"}).encode()
+        generation = self.generation
+        key = (generation, path, tuple(sorted(params.items())))
+        body = self._cache.get(key)
+        if body is not None:
+            self._cache.move_to_end(key)
+            return 200, body
+        try:
+            # pandas work runs off the event loop so slow queries don't block cached ones
+            result = await asyncio.to_thread(getattr(self.state, method), **params)
+        except (TypeError, ValueError, KeyError, IndexError) as e:
+            return 400, json.dumps({"error": str(e)}).encode()
+        body = json.dumps(result).encode()
+        if generation == self.generation:  # not computed from a state replaced meanwhile
+            self._remember(key, body)
+        return 200, body
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            if len(request_line) < 2 or request_line[0] != "GET":
+                status, body = 405, b'{"error": "only GET is supported"}'
+            else:
+                url = urllib.parse.urlsplit(request_line[1])
+                params = dict(urllib.parse.parse_qsl(url.query))
+                try:
+                    status, body = await self._answer(url.path, params)
+                except Exception as e:
+                    # still an answer: the client must not mistake a failing query for a dead service
+                    status, body = 500, json.dumps({"error": f"{type(e).__name__}: {e}"}).encode()
+            reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                      500: "Internal Server Error"}[status]
+            writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Query service listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+# ---------- CLIENT ----------
+def query(endpoint, fallback=None, timeout=30, **params):
+    """Calls the service; if no connection can be made and `fallback` (a callable
+    returning a QueryState) is given, evaluates the same endpoint in-process.
+
+    Errors from a running service (HTTP 4xx/5xx, a dropped response) are raised.
+    """
+    params = {k: str(v) for k, v in params.items() if v is not None}
+    url = f"{SERVICE_URL}/{endpoint}?{urllib.parse.urlencode(params)}"
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError:
+        raise
+    except urllib.error.URLError:
+        # urlopen wraps only failures to connect in URLError
+        if fallback is None:
+            raise
+        return getattr(fallback(), ENDPOINTS[f"/{endpoint}"])(**params)
+
+
+if __name__ == "__main__":
+    import sys
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    asyncio.run(QueryServer(QueryState()).serve(port=port))
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# Range-statistics index over a date-sorted price frame. Prefix sums give the
+# sum, count and variance of any [start, end] window and sparse tables give its
+# min / max, each in constant time once the window's row bounds are known
+# (one binary search per date). Everything is vectorised, so thousands of
+# windows can be summarised in one call.
+
+SUM_COLUMNS = ("Price", "Volatility_30", "Pct_Change")
+COUNT_COLUMNS = ("is_peak", "is_trough")
+EXTREMA_COLUMNS = ("Price",)
+TAIL_DAYS = 30
+
+
+def _prefix(values):
+    out = np.zeros(len(values) + 1, dtype=np.float64)
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+class SparseTable:
+    """Idempotent range reduction (min or max) over [i, j) in O(1) after O(n log n) build.
+
+    NaNs are ignored; an all-NaN or empty range gives NaN.
+    """
+
+    def __init__(self, values, op=np.fmin):
+        self.op = op
+        levels = [np.asarray(values, dtype=np.float64)]
+        width = 1
+        while 2 * width <= len(levels[0]):
+            prev = levels[-1]
+            levels.append(op(prev[:-width], prev[width:]))
+            width *= 2
+        self.levels = levels
+
+    def query(self, i, j):
+        """Reduction over rows [i, j); `i` and `j` may be equal-shaped integer arrays."""
+        i, j = np.asarray(i), np.asarray(j)
+        length = j - i
+        out = np.full(np.shape(i), np.nan)
+        ok = length > 0
+        k = np.zeros(np.shape(i), dtype=np.int64)
+        k[ok] = np.floor(np.log2(length[ok])).astype(np.int64)
+        for level in np.unique(k[ok]):
+            sel = ok & (k == level)
+            table = self.levels[level]
+            out[sel] = self.op(table[i[sel]], table[j[sel] - (1 << int(level))])
+        return out
+
+
+class RangeStats:
+    def __init__(self, frame, date_column="Date", sum_columns=SUM_COLUMNS,
+                 count_columns=COUNT_COLUMNS, extrema_columns=EXTREMA_COLUMNS):
+        self.dates = pd.to_datetime(frame[date_column]).to_numpy(dtype="datetime64[ns]")
+        if len(self.dates) > 1 and (np.diff(self.dates) < np.timedelta64(0)).any():
+            raise ValueError(f"'{date_column}' must be sorted ascending")
+        self.values = {}
+        self._n, self._sum, self._sumsq, self._shift = {}, {}, {}, {}
+        for col in sum_columns:
+            if col not in frame.columns:
+                continue
+            x = frame[col].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(x)
+            # shifting by the column mean keeps sum-of-squares variance numerically stable
+            shift = float(x[valid].mean()) if valid.any() else 0.0
+            centred = np.where(valid, x - shift, 0.0)
+            self.values[col] = x
+            self._n[col] = _prefix(valid)
+            self._sum[col] = _prefix(centred)
+            self._sumsq[col] = _prefix(centred * centred)
+            self._shift[col] = shift
+        self._count = {col: _prefix(frame[col].to_numpy(dtype=bool))
+                       for col in count_columns if col in frame.columns}
+        self._min = {col: SparseTable(frame[col], np.fmin) for col in extrema_columns if col in frame.columns}
+        self._max = {col: SparseTable(frame[col], np.fmax) for col in extrema_columns if col in frame.columns}
+
+    def __len__(self):
+        return len(self.dates)
+
+    # ---------- BOUNDS ----------
+    def bounds(self, start=None, end=None):
+        """Row ranges [i, j) of dates within [start, end] (inclusive days) as int arrays.
+
+        `start` / `end` may be scalars or sequences; missing values mean unbounded.
+        """
+        s = pd.to_datetime(np.atleast_1d(np.asarray(start, dtype=object))).to_numpy("datetime64[ns]")
+        e = pd.to_datetime(np.atleast_1d(np.asarray(end, dtype=object))).to_numpy("datetime64[ns]")
+        i = np.searchsorted(self.dates, s, side="left")
+        j = np.searchsorted(self.dates, e + np.timedelta64(1, "D"), side="left")
+        i[np.isnat(s)] = 0
+        j[np.isnat(e)] = len(self.dates)
+        return i, np.maximum(j, i)
+
+    # ---------- RANGE QUERIES (rows [i, j)) ----------
+    def count(self, col, i, j):
+        return self._count[col][j] - self._count[col][i]
+
+    def n_valid(self, col, i, j):
+        return self._n[col][j] - self._n[col][i]
+
+    def mean(self, col, i, j):
+        n = self.n_valid(col, i, j)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self._sum[col][j] - self._sum[col][i]) / n + self._shift[col]
+
+    def std(self, col, i, j, ddof=1):
+        n = self.n_valid(col, i, j)
+        s = self._sum[col][j] - self._sum[col][i]
+        ss = self._sumsq[col][j] - self._sumsq[col][i]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (ss - s * s / n) / (n - ddof)
+            return np.where(n > ddof, np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+    def min(self, col, i, j):
+        return self._min[col].query(i, j)
+
+    def max(self, col, i, j):
+        return self._max[col].query(i, j)
+
+    # ---------- SNAPSHOTS ----------
+    def snapshots(self, starts, ends, tail=TAIL_DAYS):
+        """One row of window statistics per (start, end) pair, computed without a per-window loop."""
+        starts, ends = list(starts), list(ends)
+        i, j = self.bounds(starts, ends)
+        t = np.maximum(i, j - tail)
+        out = pd.DataFrame({"start_date": [str(s) for s in starts], "end_date": [str(e) for e in ends],
+                            "rows": j - i})
+        if "Price" in self.values:
+            latest = np.full(len(i), np.nan)
+            latest[j > i] = self.values["Price"][j[j > i] - 1]
+            out["latest_price"] = latest
+            out["mean_price"] = self.mean("Price", i, j)
+            out["tail_mean_price"] = self.mean("Price", t, j)
+        if "Price" in self._min:
+            out["min_price"] = self.min("Price", i, j)
+            out["max_price"] = self.max("Price", i, j)
+        if "Pct_Change" in self.values:
+            out["tail_pct_change_std"] = self.std("Pct_Change", t, j)
+        if "Volatility_30" in self.values:
+            out["volatility"] = self.mean("Volatility_30", i, j)
+        if "is_peak" in self._count:
+            out["num_peaks"] = self.count("is_peak", i, j).astype(np.int64)
+        if "is_trough" in self._count:
+            out["num_troughs"] = self.count("is_trough", i, j).astype(np.int64)
+        return out
+
+    def snapshot(self, start=None, end=None, tail=TAIL_DAYS):
+        """Statistics of a single window as a JSON-able dict (NaN becomes None)."""
+        row = self.snapshots([start], [end], tail=tail).iloc[0]
+        return {k: (None if isinstance(v, float) and v != v else v.item() if hasattr(v, "item") else v)
+                for k, v in row.items()}
+
+
+if __name__ == "__main__":
+    import sys
+    from utils import add_indicators, load_futures
+
+    # usage: python range_stats.py <out.csv> [freq=MS] [window_days=90]
+    out_csv = sys.argv[1]
+    freq = sys.argv[2] if len(sys.argv) > 2 else "MS"
+    window = pd.Timedelta(days=int(sys.argv[3]) if len(sys.argv) > 3 else 90)
+    prices = add_indicators(load_futures("GC=F", start="2000-01-01")).reset_index(drop=True)
+    stats = RangeStats(prices)
+    starts = pd.date_range(prices["Date"].min(), prices["Date"].max() - window, freq=freq)
+    report = stats.snapshots(starts.date, (starts + window).date)
+    report.to_csv(out_csv, index=False)
+    print(f"Wrote {len(report)} window snapshots to {out_csv}")
@@ -0,0 +1,177 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Cheap first stage in front of the LLM, as a cascade: keyword scoring picks
+# candidate articles (and their paragraphs that mention a keyword), then
+# batched embedding similarity against the same prototype used for
+# gold_relevance_score filters and ranks those paragraphs; only candidates are
+# embedded. Articles with no surviving paragraph are dropped; the rest are cut
+# down to their best paragraphs before prompting.
+
+PROTOTYPE_SENTENCE = "gold price, bullion, inflation, gold futures, safe haven"
+
+# keyword -> weight; "gold" alone is strong evidence, macro words only support it
+GOLD_KEYWORDS = {
+    r"gold": 3.0, r"bullion": 3.0, r"precious[- ]metals?": 2.5, r"comex": 2.0,
+    r"troy ounce": 2.0, r"safe[- ]haven": 1.5, r"spdr gold|gld\b": 2.0,
+    r"inflation": 0.5, r"federal reserve|\bfed\b": 0.5, r"dollar": 0.5,
+    r"interest rates?": 0.5, r"treasury yields?": 0.5, r"silver": 0.5,
+}
+KEYWORD_RE = {kw: re.compile(r"\b(?:" + kw + r")\b", re.I) for kw in GOLD_KEYWORDS}
+
+DEFAULT_KEYWORD_THRESHOLD = 3.5   # per article; one passing "gold" (3.0) is not enough on its own
+DEFAULT_SIMILARITY_THRESHOLD = 0.35
+DEFAULT_MAX_PARAGRAPHS = 2
+
+_SENTENCE_END = re.compile(r'[.!?]["”\']?\s*$')
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=["“A-Z])')
+
+
+# ---------- PARAGRAPHS ----------
+def split_paragraphs(text, min_words=40):
+    """Rejoins PDF-wrapped lines into passages of at least `min_words` ending at a sentence end.
+
+    Lines are also cut at sentence boundaries, so content stored without line
+    breaks (one line per article in the CSVs) still splits into passages.
+    """
+    paragraphs, current, words = [], [], 0
+    for line in (part for raw in str(text).splitlines() for part in _SENTENCE_SPLIT.split(raw)):
+        line = line.strip()
+        if not line:
+            continue
+        current.append(line)
+        words += len(line.split())
+        if words >= min_words and _SENTENCE_END.search(line):
+            paragraphs.append(" ".join(current))
+            current, words = [], 0
+    if current:
+        paragraphs.append(" ".join(current))
+    return paragraphs
+
+
+# ---------- STAGE 1: KEYWORDS ----------
+def keyword_score(text):
+    return sum(w * len(KEYWORD_RE[kw].findall(text)) for kw, w in GOLD_KEYWORDS.items())
+
+
+def keyword_candidates(scores, keyword_threshold):
+    """Paragraphs with a keyword hit in articles whose total keyword score reaches the threshold."""
+    total = scores.groupby("article")["keyword_score"].transform("sum")
+    return (total >= keyword_threshold) & (scores["keyword_score"] > 0)
+
+
+# ---------- STAGE 2: EMBEDDINGS ----------
+def paragraph_similarity(paragraphs, embed_model, batch_size=64):
+    """Cosine similarity of each paragraph to the gold prototype, encoded in batches."""
+    if not paragraphs:
+        return np.empty(0, dtype=np.float32)
+    proto = embed_model.encode(PROTOTYPE_SENTENCE, normalize_embeddings=True, convert_to_numpy=True)
+    emb = embed_model.encode(paragraphs, batch_size=batch_size, normalize_embeddings=True,
+                             convert_to_numpy=True, show_progress_bar=False)
+    return (emb @ proto).astype(np.float32)
+
+
+def score_paragraphs(contents, embed_model, min_words=40, batch_size=64, min_keyword_score=0.0):
+    """One row per paragraph: article position, paragraph index, text, keyword score, similarity.
+
+    Keyword candidates for `min_keyword_score` go through the embedding model
+    in one batched call; the other paragraphs get NaN similarity.
+    """
+    rows = [(pos, i, p) for pos, content in enumerate(contents)
+            for i, p in enumerate(split_paragraphs(content, min_words))]
+    scores = pd.DataFrame(rows, columns=["article", "paragraph", "text"])
+    scores["keyword_score"] = [keyword_score(t) for t in scores["text"]]
+    candidates = keyword_candidates(scores, min_keyword_score).to_numpy()
+    scores["similarity"] = np.nan
+    scores.loc[candidates, "similarity"] = paragraph_similarity(scores.loc[candidates, "text"].tolist(),
+                                                                embed_model, batch_size)
+    return scores
+
+
+# ---------- CASCADE ----------
+def select_paragraphs(scores, n_articles, keyword_threshold=DEFAULT_KEYWORD_THRESHOLD,
+                      similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD, context=0,
+                      max_paragraphs=DEFAULT_MAX_PARAGRAPHS):
+    """Applies the thresholds to precomputed paragraph scores.
+
+    A paragraph is relevant when it is a keyword candidate (keyword_candidates)
+    and its similarity clears `similarity_threshold`. Per article the
+    `max_paragraphs` most similar relevant paragraphs (None: all) are sent in
+    their original order, with `context` neighbours on each side. Returns a
+    frame indexed by article position with `keep`, `filtered_content` and the
+    article's best scores.
+    """
+    relevant = keyword_candidates(scores, keyword_threshold) & (scores["similarity"] >= similarity_threshold)
+    ranked = scores[relevant].sort_values("similarity", ascending=False, kind="stable")
+    if max_paragraphs is not None:
+        ranked = ranked.groupby("article", sort=False).head(max_paragraphs)
+    chosen = scores.index.isin(ranked.index)
+    out = pd.DataFrame({"keep": False, "filtered_content": "", "keyword_score": 0.0, "max_similarity": 0.0},
+                       index=pd.RangeIndex(n_articles))
+    for pos, group in scores.groupby("article", sort=False):
+        hits = group["paragraph"].to_numpy()[chosen[group.index]]
+        out.at[pos, "keyword_score"] = group["keyword_score"].sum()
+        out.at[pos, "max_similarity"] = group["similarity"].fillna(0.0).max()
+        if len(hits) == 0:
+            continue
+        wanted = np.zeros(len(group), dtype=bool)
+        for h in hits:
+            wanted[max(0, h - context):h + context + 1] = True
+        out.at[pos, "keep"] = True
+        out.at[pos, "filtered_content"] = "\n\n".join(group["text"].to_numpy()[wanted])
+    return out
+
+
+def prefilter_articles(contents, embed_model, keyword_threshold=DEFAULT_KEYWORD_THRESHOLD,
+                       similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD, context=0, min_words=40,
+                       max_paragraphs=DEFAULT_MAX_PARAGRAPHS):
+    contents = [str(c) for c in contents]
+    scores = score_paragraphs(contents, embed_model, min_words=min_words, min_keyword_score=keyword_threshold)
+    return select_paragraphs(scores, len(contents), keyword_threshold, similarity_threshold, context,
+                             max_paragraphs)
+
+
+# ---------- RECALL REPORT ----------
+def approx_tokens(text):
+    return int(len(str(text).split()) * 1.3)
+
+
+def recall_report(contents, scores, positives, keyword_thresholds=(3.5, 4.5, 6.0),
+                  similarity_thresholds=(0.25, 0.35, 0.45), context=0, max_paragraphs=DEFAULT_MAX_PARAGRAPHS):
+    """Recall against labelled articles and LLM-token savings for each threshold pair.
+
+    `positives` is a boolean per article, e.g. articles where the LLM previously
+    found a gold cause on the unfiltered text. Scores are computed once (with
+    similarity for every paragraph at or above the lowest keyword threshold),
+    so the sweep is cheap.
+    """
+    positives = np.asarray(positives, dtype=bool)
+    tokens_before = sum(approx_tokens(c) for c in contents)
+    rows = []
+    for kw in keyword_thresholds:
+        for sim in similarity_thresholds:
+            sel = select_paragraphs(scores, len(contents), kw, sim, context, max_paragraphs)
+            keep = sel["keep"].to_numpy()
+            tokens_after = sum(approx_tokens(c) for c in sel.loc[keep, "filtered_content"])
+            rows.append({
+                "keyword_threshold": kw,
+                "similarity_threshold": sim,
+                "articles_kept": int(keep.sum()),
+                "recall": float(keep[positives].mean()) if positives.any() else float("nan"),
+                "missed_positives": int((positives & ~keep).sum()),
+                "token_reduction": tokens_before / max(tokens_after, 1),
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    import sys
+    from sentence_transformers import SentenceTransformer
+
+    # usage: python relevance_filter.py <causal_gold_articles_full.csv>
+    labelled = pd.read_csv(sys.argv[1])
+    contents = labelled["Content"].astype(str).tolist()
+    positives = labelled["gold_cause"].fillna("").ne("No gold cause identified.")
+    scores = score_paragraphs(contents, SentenceTransformer('all-MiniLM-L6-v2'), min_keyword_score=DEFAULT_KEYWORD_THRESHOLD)
+    print(recall_report(contents, scores, positives).to_string(index=False))
@@ -1,61 +1,61 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
-import numpy as np
-import plotly.express as px
-from sklearn.decomposition import PCA
 from collections import Counter
-import ast, os, re
-from wordcloud import WordCloud
+import re
+from event_explorer import explorer_html
+from query_service import QueryState, frame_from_json, query
 
 st.set_page_config(layout="wide", page_title="Scenario 1 – Event Memory Analysis")
 st.title("🧠 Scenario-1: Event Memory Exploration & Analysis")
 
 # ============ LOAD DATA ============
-@st.cache_data
-def load_event_data():
-    base_dir = os.path.dirname(__file__)
-    csv_path = os.path.join(base_dir, "causal_gold_articles_with_topics_bert.csv")
-    df = pd.read_csv(csv_path)
-    df["embedding"] = df["gold_general_embedding"].apply(lambda x: np.array(ast.literal_eval(x)))
-    reduced = PCA(n_components=3).fit_transform(np.vstack(df["embedding"].values))
-    df["x"], df["y"], df["z"] = reduced[:, 0], reduced[:, 1], reduced[:, 2]
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    return df.dropna(subset=["Date"])
-
-df = load_event_data()
+# events and their PCA projection are served by query_service; without a
+# running service the same state is built once per process.
+@st.cache_resource
+def local_state():
+    return QueryState()
+
+bounds = query("date_bounds", fallback=local_state)
 
 # ============ DATE SELECTION ============
-min_d, max_d = df["Date"].min().date(), df["Date"].max().date()
+min_d, max_d = [pd.Timestamp(d).date() for d in bounds["events"]]
 col1, col2 = st.columns(2)
 start_date = col1.date_input("Start Date", min_d, min_value=min_d, max_value=max_d)
 end_date = col2.date_input("End Date", max_d, min_value=min_d, max_value=max_d)
 
-mask = (df["Date"].dt.date >= start_date) & (df["Date"].dt.date <= end_date)
-filtered_df = df[mask]
+filtered_df = frame_from_json(query(
+    "events", fallback=local_state, start=start_date, end=end_date,
+    columns="Headline,assigned_topic_bert,gold_cause,gold_effect,gold_relevance_score,x,y,z"))
 
 st.markdown(f"**{len(filtered_df)}** events found between {start_date} and {end_date}.")
 
 # ============ 3D SCATTER ============
-fig_3d = px.scatter_3d(
-    filtered_df, x="x", y="y", z="z",
-    color="assigned_topic_bert",
-    hover_name="Headline",
-    hover_data={"Date": True, "gold_relevance_score": True, "assigned_topic_bert": True},
-    title=f"3D Event Map ({start_date} → {end_date})"
-)
-fig_3d.update_layout(
-    scene=dict(xaxis_title="PCA 1", yaxis_title="PCA 2", zaxis_title="PCA 3"),
-    margin=dict(l=0, r=0, b=0, t=40)
-)
-st.plotly_chart(fig_3d, use_container_width=True, config={"displayModeBar": True})
+# The explorer is built once with every event; its own sliders own the date
+# window and topic toggles, so neither the date inputs above nor any other
+# widget rebuilds or resends it.
+@st.cache_data
+def load_event_explorer():
+    events = frame_from_json(query(
+        "events", fallback=local_state,
+        columns="Headline,assigned_topic_bert,gold_relevance_score,x,y,z"))
+    return explorer_html(events, color="assigned_topic_bert", hover_columns=["gold_relevance_score"],
+                         title="3D Event Map", height=700)
+
+components.html(load_event_explorer(), height=760)
 
 # ============ ANALYSIS BUTTON ============
 if st.button("🔍 Analyse Event Window"):
+    # charting and word-cloud libraries load only when the analysis is opened
+    import plotly.express as px
+    from wordcloud import WordCloud
+
     st.subheader("📊 Event Type Frequency (Topic-BERT)")
 
     # --- Topic Frequency ---
-    topic_counts = filtered_df["assigned_topic_bert"].value_counts().reset_index()
-    topic_counts.columns = ["Topic", "Frequency"]
+    counts = query("topic_counts", fallback=local_state, start=start_date, end=end_date,
+                   column="assigned_topic_bert")
+    topic_counts = pd.DataFrame(list(counts.items()), columns=["Topic", "Frequency"])
 
     fig_topics = px.bar(
         topic_counts,
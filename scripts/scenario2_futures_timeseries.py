@@ -1,22 +1,20 @@
 # Scenario 2 – Time-Series Quantile and Peaks View
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-from scipy.signal import find_peaks
+from peak_detection import StreamingExtremaDetector
+from startup_artifacts import FAST_START, extrema_profile, load_prices
 
 st.set_page_config(layout="wide", page_title="Scenario 2 - Time Series Quantiles")
 st.title("🏆 Gold Futures Quantile & Peaks with Interactive Window")
 
 @st.cache_data
 def load_gold_futures():
-    df = yf.download("GC=F", start="2000-01-01", progress=False)
-    df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
-    df.reset_index(inplace=True)
-    df.rename(columns={"Close": "Price"}, inplace=True)
-    df["Price"] = pd.to_numeric(df["Price"], errors="coerce")
-    return df.dropna(subset=["Price"])
+    df = load_prices() if FAST_START else None
+    if df is None:
+        from utils import load_futures  # yfinance is only imported for a live download
+        df = load_futures("GC=F", start="2000-01-01")
+    return df[["Date", "Price"]]
 
 df = load_gold_futures()
 df["Q25"] = df["Price"].rolling(30).quantile(0.25)
@@ -25,10 +23,27 @@ df["Q75"] = df["Price"].rolling(30).quantile(0.75)
 df["Pct_Change"] = df["Price"].pct_change() * 100
 
 # Peaks
-peaks, _ = find_peaks(df["Price"].to_numpy().flatten(), distance=5, prominence=5)
+@st.cache_resource
+def load_extrema_profile(prices):
+    return extrema_profile(prices)
+
+st.sidebar.header("⛰ Peak Detection")
+prominence = st.sidebar.slider("Prominence (USD)", 1.0, 100.0, 5.0, step=1.0)
+distance = st.sidebar.slider("Min distance (days)", 1, 60, 5)
+peaks, _ = load_extrema_profile(df["Price"].to_numpy().flatten()).select(distance, prominence)
 df["is_peak"] = False
 df.loc[df.index[peaks], "is_peak"] = True
 
+# The profile looks at the whole history; the online detector shows the bar on
+# which a live feed would first have known each peak.
+@st.cache_data
+def peak_confirmations(prices, distance, prominence):
+    detector = StreamingExtremaDetector(prominence=prominence, distance=distance)
+    events = detector.extend(prices) + [e + (len(prices) - 1,) for e in detector.flush()]
+    return [(idx, bar) for kind, idx, _, bar in events if kind == "peak"]
+
+show_confirmations = st.sidebar.checkbox("Show when each peak was confirmed", value=False)
+
 # Date window selector
 min_date, max_date = df["Date"].min().date(), df["Date"].max().date()
 st.sidebar.header("⏱ Select Time Window")
@@ -68,6 +83,17 @@ fig.add_trace(go.Scatter(
     mode="markers", marker=dict(size=8, color="crimson", line=dict(width=1, color="white")),
     name="Detected Peaks"
 ))
+if show_confirmations:
+    confirmed = pd.DataFrame(peak_confirmations(df["Price"].to_numpy().flatten(), distance, prominence),
+                             columns=["peak", "bar"])
+    confirmed = confirmed[df["Date"].iloc[confirmed["peak"]].dt.date.between(*date_window).to_numpy()]
+    fig.add_trace(go.Scatter(
+        x=df["Date"].iloc[confirmed["bar"]], y=df["Price"].iloc[confirmed["peak"]],
+        customdata=(confirmed["bar"] - confirmed["peak"]).to_numpy(),
+        mode="markers", marker=dict(size=7, color="white", symbol="x"),
+        hovertemplate="confirmed %{x}, %{customdata} bars after the peak<extra></extra>",
+        name="Peak Confirmed"
+    ))
 fig.update_layout(
     title=f"Gold Futures Price ({date_window[0]} → {date_window[1]})",
     hovermode="x unified",
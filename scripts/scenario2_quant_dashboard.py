@@ -3,19 +3,22 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from scipy.stats import gaussian_kde
-import os, json
-from utils import load_futures, add_indicators
-import yfinance as yf
-  # Clears all locally cached Yahoo data
+from density import BinnedKDE, conditional_densities
+from event_impact import load_predictions, predictions_mtime
+import json
+from query_service import QueryState, frame_from_json, query
 
 
 st.set_page_config(layout="wide", page_title="Scenario-2 Quant Dashboard")
 st.title("📊 Scenario-2: Quantitative Analysis of Gold Futures")
 
 # ---------- LOAD FUTURES ----------
-df = load_futures("GC=F", start="2000-01-01")
-df = add_indicators(df)
+# indicators come precomputed from the query service (or a per-process QueryState without it)
+@st.cache_resource
+def local_state():
+    return QueryState()
+
+df = frame_from_json(query("prices", fallback=local_state))
 
 # ---------- SELECT DATE WINDOW ----------
 min_d, max_d = df["Date"].min().date(), df["Date"].max().date()
@@ -33,9 +36,9 @@ start_d, end_d = date_window
 mask = (df["Date"].dt.date >= start_d) & (df["Date"].dt.date <= end_d)
 filt_df = df[mask]
 
-# ---------- LOAD EVENT CSV ----------
-event_path = os.path.join(os.path.dirname(__file__), "causal_gold_articles_with_topics_bert.csv")
-event_df = pd.read_csv(event_path) if os.path.exists(event_path) else pd.DataFrame()
+# ---------- LOAD EVENTS ----------
+event_df = frame_from_json(query("events", fallback=local_state, start=start_d, end=end_d,
+                                 columns="assigned_topic_bert"))
 
 # ---------- MAIN FUTURES PLOT ----------
 fig = go.Figure()
@@ -47,6 +50,13 @@ fig.add_trace(go.Scatter(x=filt_df["Date"], y=filt_df["MA_7"],
                          mode="lines", line=dict(color="orange"), name="MA 7"))
 fig.add_trace(go.Scatter(x=filt_df["Date"], y=filt_df["MA_15"],
                          mode="lines", line=dict(color="deepskyblue"), name="MA 15"))
+extra_ma = st.sidebar.multiselect("Extra moving averages (days)", [5, 10, 20, 50, 100, 200])
+if extra_ma:
+    # every requested window comes out of one indicator grid in the query service
+    ma_grid = frame_from_json(query("indicators", fallback=local_state, family="ma",
+                                    windows=",".join(map(str, extra_ma)), start=start_d, end=end_d))
+    for w in extra_ma:
+        fig.add_trace(go.Scatter(x=ma_grid["Date"], y=ma_grid[f"MA_{w}"], mode="lines", name=f"MA {w}"))
 fig.add_trace(go.Scatter(x=filt_df.loc[filt_df["is_peak"], "Date"],
                          y=filt_df.loc[filt_df["is_peak"], "Price"],
                          mode="markers", marker=dict(size=8, color="crimson"), name="Peaks"))
@@ -68,6 +78,30 @@ if not event_df.empty and "Date" in event_df.columns:
             name="Event"
         ))
 
+# ---- Predicted event impact (written by event_impact.py) ----
+@st.cache_data
+def load_impact_predictions(mtime):
+    # keyed on the file's mtime so a rerun of event_impact.py shows up without a restart
+    return load_predictions()
+
+predictions = load_impact_predictions(predictions_mtime())
+if predictions is not None and st.sidebar.checkbox("Overlay predicted event impact", value=True):
+    horizon = st.sidebar.selectbox("Impact horizon", [c for c in predictions.columns if c.startswith("pred_ret_")])
+    # in-sample rows are the final model's fit to returns it was trained on, not predictions
+    show_fitted = st.sidebar.checkbox("Include in-sample fitted values", value=False)
+    in_window = predictions[(predictions["Date"].dt.date >= start_d) & (predictions["Date"].dt.date <= end_d)]
+    out_of_sample = in_window["out_of_sample"].astype(bool)
+    daily_impact = in_window[out_of_sample].groupby("Date")[horizon].mean()
+    fig.add_trace(go.Bar(x=daily_impact.index, y=daily_impact.values, yaxis="y2", opacity=0.5,
+                         marker_color=np.where(daily_impact.values >= 0, "lime", "crimson"),
+                         name=f"Predicted {horizon.removeprefix('pred_ret_')} return (%)"))
+    if show_fitted:
+        daily_fit = in_window[~out_of_sample].groupby("Date")[horizon].mean()
+        fig.add_trace(go.Bar(x=daily_fit.index, y=daily_fit.values, yaxis="y2", opacity=0.35,
+                             marker_color="gray", marker_pattern_shape="/",
+                             name=f"In-sample fit {horizon.removeprefix('pred_ret_')} return (%)"))
+    fig.update_layout(yaxis2=dict(title="Predicted return (%)", overlaying="y", side="right", showgrid=False))
+
 fig.update_layout(
     title=f"Gold Futures ({start_d} → {end_d}) with MA, Peaks, Troughs, and Events",
     hovermode="x unified", template="plotly_dark",
@@ -102,14 +136,31 @@ fig_macd.update_layout(template="plotly_dark", title="MACD vs Signal Line")
 st.plotly_chart(fig_macd, use_container_width=True)
 
 # ---------- KDE OF RETURNS ----------
+@st.cache_data
+def returns_density(ticker, start, end, _returns):
+    xs = np.linspace(_returns.min(), _returns.max(), 200)
+    return xs, BinnedKDE(_returns)(xs)
+
+@st.cache_data
+def topic_return_densities(ticker, start, end, _returns, _topics, xs):
+    return conditional_densities(_returns, _topics, xs)
+
 st.subheader("📈 KDE of Daily % Returns")
 returns = filt_df["Pct_Change"].dropna()
 if len(returns) > 5:
-    kde = gaussian_kde(returns)
-    xs = np.linspace(returns.min(), returns.max(), 200)
-    fig_kde = px.area(x=xs, y=kde(xs), template="plotly_dark",
+    xs, density = returns_density("GC=F", start_d, end_d, returns.to_numpy())
+    fig_kde = px.area(x=xs, y=density, template="plotly_dark",
                       labels={"x": "% Change", "y": "Density"},
                       title="Distribution of Daily % Returns")
+    if (not event_df.empty and {"Date", "assigned_topic_bert"} <= set(event_df.columns)
+            and st.checkbox("Overlay event-day return densities by topic")):
+        day_returns = filt_df.set_index(filt_df["Date"].dt.normalize())["Pct_Change"]
+        events_in_window = event_df[mask_ev].dropna(subset=["Date"])
+        event_returns = day_returns.reindex(events_in_window["Date"].dt.normalize()).to_numpy()
+        topics = events_in_window["assigned_topic_bert"].astype(str).to_numpy()
+        for topic, topic_density in topic_return_densities("GC=F", start_d, end_d,
+                                                            event_returns, topics, xs).items():
+            fig_kde.add_trace(go.Scatter(x=xs, y=topic_density, mode="lines", name=topic))
     st.plotly_chart(fig_kde, use_container_width=True)
 else:
     st.info("Not enough data for KDE estimation.")
@@ -137,14 +188,10 @@ if not event_df.empty and "Date" in event_df.columns:
     st.plotly_chart(fig_overlay, use_container_width=True)
 
 # ---------- EXPORT SNAPSHOT ----------
-snapshot = {
-    "start_date": str(start_d),
-    "end_date": str(end_d),
-    "mean_price": float(filt_df["Price"].mean()),
-    "volatility": float(filt_df["Volatility_30"].mean()),
-    "num_peaks": int(filt_df["is_peak"].sum()),
-    "num_troughs": int(filt_df["is_trough"].sum()),
-}
+stats = query("window_stats", fallback=local_state, start=start_d, end=end_d)
+snapshot = {key: stats[key] for key in
+            ("start_date", "end_date", "mean_price", "min_price", "max_price",
+             "volatility", "num_peaks", "num_troughs")}
 st.download_button("📥 Export Snapshot (JSON)",
                    json.dumps(snapshot, indent=2),
                    file_name="window_snapshot.json",
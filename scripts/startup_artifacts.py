@@ -0,0 +1,130 @@
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+
+# Precomputed startup artifacts for fast-start mode. On a cold start the
+# dashboards download prices with yfinance, compute indicators and the extrema
+# profile (scipy) and fit a PCA over every embedding (scikit-learn) before the
+# first chart is drawn. `build_artifacts` does that work once, offline; with
+# EVENT_FAST_START=1 the query service and pages read the results back with
+# pandas/numpy only and never import those libraries. Saved prices older than
+# the last completed trading day are ignored, so the pages download instead.
+#
+#   python startup_artifacts.py [ticker] [start]   # rebuild after new prices or events
+
+BASE_DIR = os.path.dirname(__file__)
+PRICES_ARTIFACT = os.path.join(BASE_DIR, "startup_prices.parquet")
+STATE_ARTIFACT = os.path.join(BASE_DIR, "startup_artifacts.npz")
+FAST_START = os.environ.get("EVENT_FAST_START", "0").lower() not in ("", "0", "false", "no")
+
+
+def price_hash(prices):
+    return hashlib.sha1(np.ascontiguousarray(prices, dtype=np.float64).ravel().tobytes()).hexdigest()
+
+
+def _load_state():
+    if not os.path.exists(STATE_ARTIFACT):
+        return None
+    with np.load(STATE_ARTIFACT) as f:
+        return {k: f[k] for k in f.files}
+
+
+# ---------- PRICES ----------
+def expected_last_bar(today=None):
+    """Last completed weekday before `today`, the newest bar a fresh download should contain."""
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+    return today - pd.offsets.BDay(1)
+
+
+def is_stale(state, today=None):
+    """True when the saved prices miss a trading day that a download made now would have.
+
+    Holidays make the previous weekday look missing; an artifact built today
+    is as fresh as a download, so it counts as current.
+    """
+    if "last_bar" not in state:  # built before freshness was recorded
+        return True
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+    built = pd.Timestamp(str(state["built"])).normalize()
+    return pd.Timestamp(str(state["last_bar"])) < expected_last_bar(today) and built < today
+
+
+def load_prices(ticker="GC=F", start="2000-01-01"):
+    """Saved price frame (indicators and quantiles included), or None when missing, stale or built for other data."""
+    state = _load_state()
+    if state is None or not os.path.exists(PRICES_ARTIFACT) or list(state["source"]) != [ticker, start]:
+        return None
+    if is_stale(state):
+        print(f"⚠️ Warning: saved prices end {state['last_bar'] if 'last_bar' in state else 'at an unknown date'}, "
+              f"before {expected_last_bar().date()}; downloading instead (rerun startup_artifacts.py)")
+        return None
+    return pd.read_parquet(PRICES_ARTIFACT)
+
+
+def extrema_profile(prices):
+    """ExtremaProfile for `prices`, restored from the artifact when it was built for this exact series."""
+    from peak_detection import ExtremaProfile
+
+    state = _load_state()
+    if state is not None and str(state["price_hash"]) == price_hash(prices):
+        return ExtremaProfile(prices, profile=(state["peaks"], state["troughs"],
+                                               state["peak_prominences"], state["trough_prominences"]))
+    return ExtremaProfile(prices)
+
+
+# ---------- PROJECTION ----------
+def fit_projection(embeddings, n_components=3):
+    """(mean, components) of a PCA fit, enough to project any later embedding without scikit-learn."""
+    from sklearn.decomposition import PCA
+
+    pca = PCA(n_components=n_components).fit(embeddings)
+    return pca.mean_.astype(np.float32), pca.components_.astype(np.float32)
+
+
+def project(embeddings, mean, components):
+    # same as PCA.transform without whitening
+    return ((np.asarray(embeddings, dtype=np.float32) - mean) @ components.T).astype(np.float32)
+
+
+def event_projection(embeddings, fast=None):
+    """(n, 3) float32 PCA coordinates of `embeddings`.
+
+    In fast-start mode the saved components are applied, so events added since
+    the build are placed in the same space; otherwise the PCA is refitted.
+    """
+    fast = FAST_START if fast is None else fast
+    state = _load_state() if fast else None
+    if state is not None and state["pca_components"].shape[1:] == np.shape(embeddings)[1:]:
+        return project(embeddings, state["pca_mean"], state["pca_components"])
+    return project(embeddings, *fit_projection(embeddings))
+
+
+# ---------- BUILD ----------
+def build_artifacts(ticker="GC=F", start="2000-01-01"):
+    from event_store import EMBEDDING_COLUMN, EVENT_CSV, EVENT_DATASET, load_events
+    from peak_detection import ExtremaProfile
+    from utils import add_indicators, add_quantiles, load_futures
+
+    prices = add_quantiles(add_indicators(load_futures(ticker, start=start))).reset_index(drop=True)
+    prices.to_parquet(PRICES_ARTIFACT, index=False)
+    profile = ExtremaProfile(prices["Price"])
+
+    mean, components = np.empty(0, np.float32), np.empty((0, 0), np.float32)
+    if os.path.isdir(EVENT_DATASET) or os.path.exists(EVENT_CSV):
+        _, embeddings = load_events(columns=[EMBEDDING_COLUMN])
+        mean, components = fit_projection(embeddings)
+    np.savez(STATE_ARTIFACT, source=np.asarray([ticker, start]), price_hash=np.asarray(price_hash(prices["Price"])),
+             built=np.asarray(str(pd.Timestamp.today().date())), last_bar=np.asarray(str(prices["Date"].max().date())),
+             peaks=profile.peaks, troughs=profile.troughs, peak_prominences=profile.peak_prominences,
+             trough_prominences=profile.trough_prominences, pca_mean=mean, pca_components=components)
+    return len(prices), len(components)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # usage: python startup_artifacts.py [ticker] [start]
+    n_prices, n_components = build_artifacts(*sys.argv[1:3])
+    print(f"✅ Saved {n_prices} price rows to {PRICES_ARTIFACT} and extrema/PCA ({n_components} components) "
+          f"to {STATE_ARTIFACT}")
@@ -0,0 +1,147 @@
+import ast
+import json
+import os
+import subprocess
+import sys
+import pandas as pd
+
+# Startup profile of the Streamlit entry points. Streamlit re-runs a page on
+# every interaction but imports each module once per server process, so the
+# first visitor pays for every top-level import plus the data loading before
+# anything is drawn. Each measurement runs in a fresh interpreter (streamlit
+# itself preloaded, as in a running server):
+#   - the cost of each top-level import of a page, in page order
+#   - building the shared QueryState, from startup artifacts or from scratch
+#   - a full cold script run through streamlit's AppTest, checked against
+#     TARGET_FIRST_RENDER_S (when streamlit is installed)
+#
+#   python startup_profile.py [--full] [page.py ...]    # --full: without EVENT_FAST_START
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ENTRY_POINTS = ["main_app.py", "scenario1_event_analysis.py", "scenario1_event_embeddings.py",
+                "scenario2_futures_timeseries.py", "scenario2_quant_dashboard.py",
+                "streamlit_gold_embeddings_visualisation.py"]
+TARGET_FIRST_RENDER_S = 2.0
+HEAVY_IMPORT_S = 0.1
+
+_PRELOAD = """
+import json, sys, time
+try:
+    import streamlit  # already loaded in a running server
+except ImportError:
+    pass
+"""
+
+_IMPORTS = _PRELOAD + """
+import importlib
+out = []
+for name in sys.argv[1:]:
+    t0 = time.perf_counter()
+    try:
+        importlib.import_module(name)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    out.append([name, time.perf_counter() - t0, error])
+print(json.dumps(out))
+"""
+
+_STATE = _PRELOAD + """
+t0 = time.perf_counter()
+from query_service import QueryState
+QueryState()
+print(json.dumps(time.perf_counter() - t0))
+"""
+
+_RENDER = _PRELOAD + """
+from streamlit.testing.v1 import AppTest
+t0 = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=600).run()
+print(json.dumps([time.perf_counter() - t0, [e.message for e in app.exception]]))
+"""
+
+
+def _run(code, args=(), fast=True):
+    env = dict(os.environ, EVENT_FAST_START="1" if fast else "0")
+    proc = subprocess.run([sys.executable, "-c", code, *args], cwd=BASE_DIR, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def page_imports(path):
+    """Modules imported at the top level of a page, in order (imports inside panels are skipped)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def import_profile(path, fast=True):
+    """Seconds each top-level import adds in a fresh interpreter (error is set when it fails)."""
+    rows = _run(_IMPORTS, page_imports(os.path.join(BASE_DIR, path)), fast)
+    return pd.DataFrame(rows, columns=["module", "seconds", "error"])
+
+
+def state_seconds(fast=True):
+    return _run(_STATE, fast=fast)
+
+
+def first_render_seconds(path, fast=True):
+    """(seconds, exceptions) for one cold run of the page script; None without streamlit."""
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        return None
+    return tuple(_run(_RENDER, [os.path.join(BASE_DIR, path)], fast))
+
+
+def _try(fn, *args, **kwargs):
+    try:
+        return fn(*args, **kwargs), None
+    except Exception as e:
+        return None, str(e)
+
+
+if __name__ == "__main__":
+    # usage: python startup_profile.py [--full] [page.py ...]
+    args = sys.argv[1:]
+    fast = "--full" not in args
+    pages = [a for a in args if a != "--full"] or ENTRY_POINTS
+    print(f"Mode: {'fast start (EVENT_FAST_START=1)' if fast else 'full'}\n")
+
+    for mode in (True, False):
+        seconds, error = _try(state_seconds, mode)
+        label = "artifacts" if mode else "from scratch"
+        print(f"QueryState ({label}): " + (f"{seconds:.2f} s" if error is None else f"failed ({error})"))
+
+    renders = {}
+    for page in pages:
+        profile = import_profile(page, fast)
+        heavy = profile[(profile["seconds"] >= HEAVY_IMPORT_S) | profile["error"].notna()].fillna({"error": ""})
+        print(f"\n=== {page}: top-level imports {profile['seconds'].sum():.2f} s")
+        for row in heavy.sort_values("seconds", ascending=False).itertuples():
+            print(f"  {row.module:<32} {row.seconds:6.2f} s" + (f"  ({row.error})" if row.error else ""))
+        render, error = _try(first_render_seconds, page, fast)
+        if error is not None:
+            print(f"  first render: failed ({error})")
+        elif render is None:
+            print("  first render: streamlit not installed, skipped")
+        else:
+            seconds, exceptions = render
+            renders[page] = seconds <= TARGET_FIRST_RENDER_S and not exceptions
+            status = "✅" if seconds <= TARGET_FIRST_RENDER_S and not exceptions else "❌"
+            print(f"  first render: {seconds:.2f} s (target {TARGET_FIRST_RENDER_S:.1f} s) {status}"
+                  + (f"  exceptions: {exceptions}" if exceptions else ""))
+
+    missed = [page for page, ok in renders.items() if not ok]
+    print(f"\nFirst render within {TARGET_FIRST_RENDER_S:.1f} s: {len(renders) - len(missed)}/{len(renders)} "
+          f"measured pages" + (f", not measured: {len(pages) - len(renders)}" if len(renders) < len(pages) else "")
+          + (f", missed: {', '.join(missed)}" if missed else ""))
+    sys.exit(1 if missed else 0)
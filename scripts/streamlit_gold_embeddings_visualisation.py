@@ -1,32 +1,20 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 import plotly.express as px
-from sklearn.decomposition import PCA
-import ast
+from event_store import EMBEDDING_COLUMN, load_events
+from startup_artifacts import event_projection
 
 st.set_page_config(layout="wide")
 st.title("🪙 3D Visualization of Gold News Articles Over Time")
-df_with_embeddings = pd.read_csv("scripts/causal_gold_articles_with_topics_bert.csv")
 
-# Load the CSV file
-df = df_with_embeddings.copy()
+# Compact frame (categorical topics, no embedding strings) plus one float32
+# embedding matrix, instead of the raw CSV, a copy and per-row arrays
+df, embeddings = load_events(columns=["Doc_ID", "Headline", "assigned_topic", "gold_relevance_score",
+                                      "topic_similarity", EMBEDDING_COLUMN])
 
-# Convert 'gold_general_embedding' from string to list of floats
-df["embedding"] = df["gold_general_embedding"].apply(lambda x: np.array(ast.literal_eval(x)))
-
-# Stack embeddings into a 2D array
-embeddings = np.vstack(df["embedding"].values)
-
-# Reduce to 3D using PCA
-pca = PCA(n_components=3)
-reduced = pca.fit_transform(embeddings)
+# Reduce to 3D using PCA (saved components in fast-start mode)
+reduced = event_projection(embeddings)
 df["x"], df["y"], df["z"] = reduced[:, 0], reduced[:, 1], reduced[:, 2]
 
-# Convert Date to datetime and drop malformed rows
-df["Date"] = pd.to_datetime(df["Date"], errors='coerce')
-df = df.dropna(subset=["Date"])
-
 # Create date range slider using native Python datetime.date
 min_date = df["Date"].min().date()
 max_date = df["Date"].max().date()
@@ -1,16 +1,17 @@
-import re
 import json
-import subprocess
 import os
+from factiva import scan_file
+from llm_json import ARTICLE_SCHEMA, extract_json
 
-# Function to split articles based on "--- Page X ---"
+# Function to split a Factiva export into articles (one per TOC entry)
 def split_articles(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-
-    # Split by "--- Page X ---" to get each article individually
-    articles = re.split(r"--- Page \d+ ---", content)
-    return [article.strip() for article in articles if article.strip()]
+    document = scan_file(file_path)
+    if document.articles:
+        texts = [article.content for article in document.articles]
+    else:
+        # no table of contents: fall back to one chunk per "--- Page X ---" page
+        texts = [document.page(n).strip() for n in range(1, len(document.page_spans))]
+    return [text for text in texts if text]
 
 # Function to create prompt for Ollama model
 def create_prompt_for_article(article_text):
@@ -35,36 +36,6 @@ Please output strictly as JSON.
 """
     return prompt_text
 
-# Function to run Ollama prompt and get the response
-def run_ollama_prompt(model_name, prompt_text):
-    try:
-        command = ['ollama', 'run', model_name]
-        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='utf-8')
-        stdout, stderr = process.communicate(input=prompt_text)
-
-        if process.returncode != 0:
-            print(f"Error: {stderr}")
-            return None
-
-        return stdout.strip()
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
-# Function to enforce JSON format and validate the output
-def enforce_json_format(output):
-    # Attempt to find JSON using regex to capture from the first '{' to the last '}'
-    json_match = re.search(r'{.*}', output, re.DOTALL)
-    if json_match:
-        json_str = json_match.group(0)
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            print("Error: Could not decode as JSON.")
-            return None
-    else:
-        print("Error: JSON not found in output.")
-    return None
-
 # Function to process all articles from a given text file using the model
 def process_articles_with_model(file_path, model_name):
     articles = split_articles(file_path)
@@ -73,10 +44,9 @@ def process_articles_with_model(file_path, model_name):
     for i, article_text in enumerate(articles):
         print(f"Processing article {i+1}/{len(articles)}")
         prompt_text = create_prompt_for_article(article_text)
-        output = run_ollama_prompt(model_name, prompt_text)
 
-        # Enforce JSON formatting and validation
-        structured_data = enforce_json_format(output)
+        # Stream the response, stop once the JSON closes, repair only on failure
+        structured_data = extract_json(model_name, prompt_text, ARTICLE_SCHEMA)
         if structured_data:
             structured_articles.append(structured_data)
         else:
@@ -3,7 +3,7 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from scipy.signal import find_peaks
+from peak_detection import ExtremaProfile
 
 st.set_page_config(layout="wide", page_title="Gold Futures Interactive Dashboard")
 st.title("🏆 Gold Futures Quantile & Peaks with Interactive Time Window")
@@ -28,7 +28,14 @@ df["Q75"] = df["Price"].rolling(30).quantile(0.75)
 df["Pct_Change"] = df["Price"].pct_change() * 100
 
 # ---- Detect Peaks ----
-peaks, _ = find_peaks(df["Price"].to_numpy().flatten(), distance=5, prominence=5)
+@st.cache_resource
+def load_extrema_profile(prices):
+    return ExtremaProfile(prices)
+
+st.sidebar.header("⛰ Peak Detection")
+prominence = st.sidebar.slider("Prominence (USD)", 1.0, 100.0, 5.0, step=1.0)
+distance = st.sidebar.slider("Min distance (days)", 1, 60, 5)
+peaks, _ = load_extrema_profile(df["Price"].to_numpy().flatten()).select(distance, prominence)
 df["is_peak"] = False
 df.loc[df.index[peaks], "is_peak"] = True
 
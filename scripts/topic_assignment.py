@@ -0,0 +1,137 @@
+import json
+import numpy as np
+import pandas as pd
+
+# Topic assignment against a matrix of topic prototypes. Each topic is a few
+# descriptive phrases; its prototype is the normalised mean of their
+# embeddings (same all-MiniLM-L6-v2 space as gold_general_embedding). All
+# articles are scored with one blocked matrix multiply, and since phrase
+# embeddings are cached, editing a topic only re-encodes that topic's phrases.
+
+EMBED_MODEL = "all-MiniLM-L6-v2"
+OTHER_TOPIC = "Other"
+DEFAULT_THRESHOLD = 0.30  # below this best similarity, assigned_topic falls back to OTHER_TOPIC
+DEFAULT_TOP_K = 3
+
+DEFAULT_TOPICS = {
+    "Inflation": ["inflation data and consumer prices", "gold as an inflation hedge", "rising CPI and cost of living"],
+    "Fed & Interest Rates": ["Federal Reserve interest rate decision", "rate cuts and rate hikes",
+                             "real yields and treasury bonds"],
+    "US Dollar": ["US dollar strength or weakness", "dollar index and currency moves"],
+    "Geopolitical Risk": ["war, conflict and geopolitical tension", "safe haven demand during crisis",
+                          "sanctions and political uncertainty"],
+    "Central Bank Buying": ["central banks buying gold reserves", "official sector gold purchases"],
+    "ETF & Investment Flows": ["gold ETF inflows and outflows", "investor positioning in gold futures",
+                               "speculative bets and options trading on gold"],
+    "Physical Demand": ["jewellery demand in India and China", "physical bullion, bars and coins demand"],
+    "Mining & Supply": ["gold mining output and production costs", "mine supply and recycling of gold"],
+    "Market Turmoil": ["stock market sell-off and volatility", "recession fears and economic slowdown"],
+    "Trade & Tariffs": ["tariffs and trade war", "trade policy uncertainty and global trade"],
+}
+
+
+def _normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+# ---------- PROTOTYPES ----------
+class TopicPrototypes:
+    """Ordered topic labels and their (k, dim) unit-norm prototype matrix."""
+
+    def __init__(self, embed_model, topics=DEFAULT_TOPICS):
+        self.embed_model = embed_model
+        self._phrase_cache = {}
+        self.topics = {}
+        self.update(topics)
+
+    def _encode(self, phrases):
+        missing = [p for p in phrases if p not in self._phrase_cache]
+        if missing:
+            emb = self.embed_model.encode(missing, normalize_embeddings=True, convert_to_numpy=True,
+                                          show_progress_bar=False)
+            self._phrase_cache.update(zip(missing, emb.astype(np.float32)))
+        return np.stack([self._phrase_cache[p] for p in phrases])
+
+    def update(self, topics):
+        """Adds or redefines topics ({label: [phrases]}); only unseen phrases are encoded."""
+        for label, phrases in topics.items():
+            self.topics[label] = [phrases] if isinstance(phrases, str) else list(phrases)
+        self._rebuild()
+
+    def remove(self, label):
+        self.topics.pop(label, None)
+        self._rebuild()
+
+    def _rebuild(self):
+        self.labels = list(self.topics)
+        self.matrix = _normalize([self._encode(p).mean(axis=0) for p in self.topics.values()])
+
+
+# ---------- ASSIGNMENT ----------
+def top_topics(embeddings, prototypes, top_k=1, block_size=8192):
+    """Indices and cosine similarities of the `top_k` closest prototypes per row, best first.
+
+    Rows are normalised and multiplied against the prototype matrix block by
+    block, so memory stays at block_size x n_topics however large the corpus.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    prototypes = _normalize(prototypes)
+    n, k = len(embeddings), len(prototypes)
+    top_k = min(top_k, k)
+    idx = np.empty((n, top_k), dtype=np.int64)
+    sim = np.empty((n, top_k), dtype=np.float32)
+    for lo in range(0, n, block_size):
+        sims = _normalize(embeddings[lo:lo + block_size]) @ prototypes.T
+        if top_k == 1:
+            best = sims.argmax(axis=1)[:, None]
+        else:
+            best = np.argpartition(-sims, top_k - 1, axis=1)[:, :top_k]
+            order = np.argsort(-np.take_along_axis(sims, best, axis=1), axis=1)
+            best = np.take_along_axis(best, order, axis=1)
+        idx[lo:lo + block_size] = best
+        sim[lo:lo + block_size] = np.take_along_axis(sims, best, axis=1)
+    return idx, sim
+
+
+def assign_topics(df, embeddings, prototypes, threshold=DEFAULT_THRESHOLD, top_k=DEFAULT_TOP_K):
+    """Copy of `df` with the topic columns the dashboards read.
+
+    assigned_topic_bert is the nearest topic; assigned_topic is the same but
+    OTHER_TOPIC when the best similarity is under `threshold`; topic_similarity
+    is that best similarity; assigned_topics lists every top-k topic at or
+    above the threshold (multi-label, " | " separated).
+    """
+    labels = np.asarray(prototypes.labels, dtype=object)
+    idx, sim = top_topics(embeddings, prototypes.matrix, top_k=top_k)
+    out = df.copy()
+    out["assigned_topic_bert"] = labels[idx[:, 0]]
+    out["assigned_topic"] = np.where(sim[:, 0] >= threshold, labels[idx[:, 0]], OTHER_TOPIC)
+    out["topic_similarity"] = np.round(sim[:, 0], 4)
+    out["assigned_topics"] = [" | ".join(labels[i][s >= threshold]) for i, s in zip(idx, sim)]
+    return out
+
+
+def parse_embeddings(column):
+    # stored as Python list reprs, which are valid JSON
+    return np.array([json.loads(x) for x in column], dtype=np.float32)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    from sentence_transformers import SentenceTransformer
+    from event_store import EMBEDDING_COLUMN, EVENT_CSV, EVENT_DATASET, write_event_dataset
+
+    # usage: python topic_assignment.py <causal_gold_articles_full.csv> [out.csv]
+    input_csv = sys.argv[1]
+    output_csv = sys.argv[2] if len(sys.argv) > 2 else EVENT_CSV
+    df = pd.read_csv(input_csv)
+    prototypes = TopicPrototypes(SentenceTransformer(EMBED_MODEL))
+    out = assign_topics(df, parse_embeddings(df[EMBEDDING_COLUMN]), prototypes)
+    out.to_csv(output_csv, index=False)
+    print(out["assigned_topic"].value_counts().to_string())
+    print(f"✅ Wrote topics for {len(out)} articles to {output_csv}")
+    if os.path.abspath(output_csv) == os.path.abspath(EVENT_CSV) and os.path.isdir(EVENT_DATASET):
+        print(f"Rebuilt {write_event_dataset(output_csv)} events in {EVENT_DATASET}")
@@ -1,10 +1,12 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
-from scipy.signal import find_peaks
+from indicators import IndicatorGrid
+from peak_detection import ExtremaProfile
 
 # ---------- LOAD GOLD FUTURES ----------
 def load_futures(ticker="GC=F", start="2000-01-01"):
+    import yfinance as yf  # slow to import; only needed when prices are actually downloaded
+
     df = yf.download(ticker, start=start, progress=False)
     df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
     df.reset_index(inplace=True)
@@ -13,6 +15,12 @@ def load_futures(ticker="GC=F", start="2000-01-01"):
     df.dropna(subset=["Price"], inplace=True)
     return df
 
+# ---------- ROLLING QUANTILES ----------
+def add_quantiles(df, window=30, quantiles=(25, 50, 75)):
+    for q in quantiles:
+        df[f"Q{q}"] = df["Price"].rolling(window).quantile(q / 100)
+    return df
+
 # ---------- RSI ----------
 def compute_RSI(series, window=14):
     delta = series.diff()
@@ -31,19 +39,18 @@ def compute_MACD(price, short=12, long=26, signal=9):
 
 # ---------- PEAKS / TROUGHS ----------
 def detect_peaks_troughs(series, distance=5, prominence=5):
-    peaks, _ = find_peaks(series, distance=distance, prominence=prominence)
-    troughs, _ = find_peaks(-series, distance=distance, prominence=prominence)
-    return peaks, troughs
+    return ExtremaProfile(series).select(distance=distance, prominence=prominence)
 
 # ---------- TECHNICAL INDICATORS PIPE ----------
 def add_indicators(df):
-    df["MA_7"] = df["Price"].rolling(7).mean()
-    df["MA_15"] = df["Price"].rolling(15).mean()
-    df["Volatility_30"] = df["Price"].pct_change().rolling(30).std() * 100
-    df["Pct_Change"] = df["Price"].pct_change() * 100
-    df["RSI_14"] = compute_RSI(df["Price"])
-    df["MACD"], df["Signal"] = compute_MACD(df["Price"])
-    df["MA_corr"] = df["MA_7"].rolling(30).corr(df["MA_15"])
+    grid = IndicatorGrid(df["Price"])
+    df["MA_7"], df["MA_15"] = grid.sma([7, 15]).T
+    df["Volatility_30"] = grid.volatility([30])[:, 0]
+    df["Pct_Change"] = grid.pct_change
+    df["RSI_14"] = grid.rsi([14])[:, 0]
+    macd, signal = grid.macd([(12, 26, 9)])
+    df["MACD"], df["Signal"] = macd[:, 0], signal[:, 0]
+    df["MA_corr"] = grid.ma_corr([(7, 15)], window=30)[:, 0]
     peaks, troughs = detect_peaks_troughs(df["Price"])
     df["is_peak"], df["is_trough"] = False, False
     df.loc[peaks, "is_peak"] = True